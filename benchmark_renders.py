@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark render cost against input size.
+
+Renders the sorting scenes with synthetic inputs of increasing size at
+preview quality, each case in a fresh process with an empty media
+directory, and records wall time, play() count, frame count and peak
+memory. Results are checked against benchmarks/baseline.json.
+
+Usage:
+    poetry run python benchmark_renders.py                     # run and check against the baseline
+    poetry run python benchmark_renders.py --update-baseline   # run and record a new baseline
+    poetry run python benchmark_renders.py --sizes 4 8 16 --scenes BinaryInsertionSort
+"""
+
+import argparse
+import json
+import math
+import random
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from scene_runner import load_scene_class, render_scene
+
+BASELINE_FILE = Path("benchmarks") / "baseline.json"
+DEFAULT_SIZES = [4, 8, 16, 32, 64]
+
+def pairwise_inputs(n):
+    """Synthetic task list with a fixed random priority order."""
+    names = [f"Synthetic task {i + 1}" for i in range(n)]
+    priorities = random.Random(n).sample(range(1, n + 1), n)
+    return {"TASK_NAMES": names, "TASK_PRIORITIES": dict(zip(names, priorities))}
+
+def array_inputs(n):
+    """Synthetic array in a fixed random order."""
+    return {"ARRAY": random.Random(n).sample(range(1, n + 1), n)}
+
+# scene class -> (scene file, builder of class attributes for an input of size n)
+BENCHMARK_SCENES = {
+    "PairwiseComparisonSort": ("pairwise_comparison_animation.py", pairwise_inputs),
+    "BinaryInsertionSort": ("binary_insertion_sort.py", array_inputs),
+}
+
+def run_case(scene_class, n, fps):
+    """Render one scene at input size n and measure it. Runs in a fresh process."""
+    scene_file, build_inputs = BENCHMARK_SCENES[scene_class]
+    base = load_scene_class(scene_file, scene_class)
+    cls = type(scene_class, (base,), build_inputs(n))
+
+    run_times = []
+
+    def record(scene, kind):
+        run_times.append(scene.duration)
+
+    # An empty media directory keeps manim's partial movie cache from hiding render cost
+    with tempfile.TemporaryDirectory() as media_dir:
+        started = time.perf_counter()
+        render_scene(scene_file, cls, media_dir, fps, "l", after_play=record)
+        wall_time = time.perf_counter() - started
+
+    return {
+        "scene": scene_class,
+        "n": n,
+        "wall_time": round(wall_time, 3),
+        "plays": len(run_times),
+        "frames": sum(max(1, math.ceil(run_time * fps)) for run_time in run_times),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+def print_results(results):
+    """Print results per scene with the growth exponent between sizes."""
+    print(f"\n{'scene':<24} {'n':>4} {'wall (s)':>9} {'plays':>6} {'frames':>7} {'rss (MB)':>9} {'growth':>7}")
+    previous = None
+    for result in results:
+        growth = ""
+        if previous and previous["scene"] == result["scene"] and previous["wall_time"] > 0:
+            # Exponent k in time ~ n^k between consecutive sizes; 1.0 is linear
+            k = math.log(result["wall_time"] / previous["wall_time"]) / math.log(result["n"] / previous["n"])
+            growth = f"n^{k:.2f}"
+        print(f"{result['scene']:<24} {result['n']:>4} {result['wall_time']:>9.2f} {result['plays']:>6} "
+              f"{result['frames']:>7} {result['peak_rss_mb']:>9.1f} {growth:>7}")
+        previous = result
+
+def check_regressions(results, baseline, tolerance):
+    """Compare results with the baseline; return a list of regression messages."""
+    expected = {(entry["scene"], entry["n"]): entry for entry in baseline["results"]}
+    regressions = []
+    for result in results:
+        entry = expected.get((result["scene"], result["n"]))
+        if entry is None:
+            continue
+        label = f"{result['scene']} n={result['n']}"
+        for field in ("wall_time", "peak_rss_mb"):
+            if result[field] > entry[field] * tolerance:
+                regressions.append(f"{label}: {field} {entry[field]} -> {result[field]}")
+        for field in ("plays", "frames"):
+            if result[field] > entry[field]:
+                regressions.append(f"{label}: {field} {entry[field]} -> {result[field]}")
+    return regressions
+
+def main():
+    """Run the benchmark matrix and check or update the baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark scene render cost against input size.")
+    parser.add_argument("--scenes", nargs="+", choices=sorted(BENCHMARK_SCENES), default=sorted(BENCHMARK_SCENES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--fps", type=int, default=1)
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="allowed wall time / memory ratio over the baseline (default: 1.25)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = []
+    # One process per case, so peak memory and imports don't carry over
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+        for scene_class in args.scenes:
+            for n in sorted(args.sizes):
+                print(f"Rendering {scene_class} with n={n}...")
+                results.append(pool.submit(run_case, scene_class, n, args.fps).result())
+
+    print_results(results)
+
+    settings = {"fps": args.fps, "quality": "l"}
+    if args.update_baseline:
+        BASELINE_FILE.parent.mkdir(exist_ok=True)
+        BASELINE_FILE.write_text(json.dumps({**settings, "results": results}, indent=2))
+        print(f"\nBaseline written to {BASELINE_FILE}")
+        return
+
+    if not BASELINE_FILE.exists():
+        print("\nNo baseline yet; record one with --update-baseline")
+        return
+
+    baseline = json.loads(BASELINE_FILE.read_text())
+    if {key: baseline.get(key) for key in settings} != settings:
+        print(f"\nBaseline was recorded with {baseline.get('fps')}fps; not comparing")
+        return
+
+    regressions = check_regressions(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions against baseline:")
+        for message in regressions:
+            print(f"  {message}")
+        sys.exit(1)
+    print("\n✓ No regressions against baseline")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
 from manim import *
 import numpy as np
 
-class BinaryInsertionSort(Scene):
+from scene_datasets import DatasetMixin
+from sorting_trace import split_insertions, trace_sort
+from text_cache import cached_text
+from timing_profiles import TimingProfileMixin
+
+class BinaryInsertionSort(DatasetMixin, TimingProfileMixin, Scene):
+    # Array to sort
+    ARRAY = [5, 2, 8, 1, 9, 3, 7, 4, 6]
+
     def construct(self):
         # Title
         title = Text("Binary Insertion Sort Animation", font_size=48)
@@ -10,7 +18,7 @@ class BinaryInsertionSort(Scene):
         self.wait(1)
         
         # Initial array
-        arr = [5, 2, 8, 1, 9, 3, 7, 4, 6]
+        arr = list(self.ARRAY)
         
         # Create visual array
         self.create_array_visual(arr)
@@ -38,7 +46,7 @@ class BinaryInsertionSort(Scene):
         # Create rectangles and numbers for each element
         for i, val in enumerate(arr):
             rect = Rectangle(width=0.8, height=0.8, stroke_color=WHITE, fill_color=BLUE, fill_opacity=0.3)
-            num = Text(str(val), font_size=24, color=WHITE)
+            num = cached_text(str(val), 24, WHITE)
             
             # Position elements
             rect.move_to(LEFT * 4 + RIGHT * i * 1.0)
@@ -50,7 +58,7 @@ class BinaryInsertionSort(Scene):
         # Add index labels
         self.index_labels = []
         for i in range(len(arr)):
-            index_label = Text(str(i), font_size=18, color=GRAY)
+            index_label = cached_text(str(i), 18, GRAY)
             index_label.next_to(self.array_mobjects[i], DOWN, buff=0.3)
             self.index_labels.append(index_label)
         
@@ -67,7 +75,13 @@ class BinaryInsertionSort(Scene):
         status_text.to_edge(DOWN)
         self.play(Write(status_text))
         
-        for i in range(1, n):
+        # Sort once up front: "A" (goes first) when the key is smaller. Items are
+        # the original indices, so item i sits at position i when its insertion starts.
+        trace = trace_sort(range(n), lambda a, b: "A" if arr[a] < arr[b] else "B")
+        
+        for insertion in split_insertions(trace)[1:]:
+            i = insertion["item"]
+            
             # Highlight current element
             self.play(self.array_mobjects[i][0].animate.set_fill(RED, 0.7))
             
@@ -79,10 +93,9 @@ class BinaryInsertionSort(Scene):
             key = arr[i]
             
             # Show binary search process
-            left, right = 0, i
-            
-            while left < right:
-                mid = (left + right) // 2
+            for comparison in insertion["comparisons"]:
+                left, right, mid = comparison["low"], comparison["high"] + 1, comparison["mid"]
+                mid_value = self.array_values[mid]
                 
                 # Highlight search range
                 self.highlight_range(left, right, YELLOW)
@@ -91,17 +104,15 @@ class BinaryInsertionSort(Scene):
                 self.play(self.array_mobjects[mid][0].animate.set_fill(GREEN, 0.7))
                 
                 # Show comparison
-                comparison_text = Text(f"Compare {key} with {arr[mid]}", font_size=20)
+                comparison_text = cached_text(f"Compare {key} with {mid_value}", 20)
                 comparison_text.next_to(status_text, UP, buff=0.3)
                 self.play(Write(comparison_text))
                 self.wait(1)
                 
-                if key < arr[mid]:
-                    right = mid
-                    result_text = Text(f"{key} < {arr[mid]}, search left half", font_size=20, color=BLUE)
+                if comparison["choice"] == "A":
+                    result_text = Text(f"{key} < {mid_value}, search left half", font_size=20, color=BLUE)
                 else:
-                    left = mid + 1
-                    result_text = Text(f"{key} >= {arr[mid]}, search right half", font_size=20, color=BLUE)
+                    result_text = Text(f"{key} >= {mid_value}, search right half", font_size=20, color=BLUE)
                 
                 result_text.next_to(comparison_text, DOWN, buff=0.2)
                 self.play(Write(result_text))
@@ -117,7 +128,7 @@ class BinaryInsertionSort(Scene):
                 self.clear_range_highlight(0, i)
             
             # Found insertion position
-            pos = left
+            pos = insertion["index"]
             
             # Highlight insertion position
             if pos < i:
@@ -142,49 +153,47 @@ class BinaryInsertionSort(Scene):
         # Final cleanup
         self.play(FadeOut(status_text))
         
-        # Highlight entire array as sorted
-        for mob in self.array_mobjects:
-            self.play(mob[0].animate.set_fill(GREEN, 0.5), run_time=0.2)
+        # Highlight entire array as sorted, sweeping left to right
+        self.play(
+            LaggedStart(*[mob[0].animate.set_fill(GREEN, 0.5) for mob in self.array_mobjects], lag_ratio=0.2),
+            run_time=1.0
+        )
     
+    # Each step below is a single play() whatever the array size, so the number
+    # of partial movie files grows with the comparisons rather than with n.
     def highlight_range(self, left, right, color):
-        for i in range(left, right):
-            self.play(self.array_mobjects[i][0].animate.set_stroke(color, 3), run_time=0.3)
+        self.play(
+            LaggedStart(*[self.array_mobjects[i][0].animate.set_stroke(color, 3) for i in range(left, right)],
+                        lag_ratio=0.3),
+            run_time=0.5
+        )
     
     def clear_range_highlight(self, left, right):
-        for i in range(left, right):
-            self.play(self.array_mobjects[i][0].animate.set_stroke(WHITE, 1), run_time=0.1)
+        self.play(*[self.array_mobjects[i][0].animate.set_stroke(WHITE, 1) for i in range(left, right)],
+                  run_time=0.2)
     
     def shift_elements(self, pos, current_pos, key):
-        # Shift elements to the right
-        for j in range(current_pos, pos, -1):
-            self.array_values[j] = self.array_values[j - 1]
-            
-            # Animate the swap
-            self.play(
-                self.array_mobjects[j][1].animate.become(
-                    Text(str(self.array_values[j]), font_size=24, color=WHITE)
-                    .move_to(self.array_mobjects[j][1].get_center())
-                ),
-                run_time=0.5
-            )
-        
-        # Insert the key at the correct position
+        # Move the existing digits: the key arcs over to pos while the others shift right by one cell
+        digits = [self.array_mobjects[j][1] for j in range(pos, current_pos + 1)]
+        key_digit = digits[-1]
+        shifted = [key_digit] + digits[:-1]
+        
+        animations = [key_digit.animate(path_arc=PI / 2).move_to(self.array_mobjects[pos][0].get_center())]
+        for j, digit in enumerate(digits[:-1], start=pos + 1):
+            animations.append(digit.animate.move_to(self.array_mobjects[j][0].get_center()))
+        self.play(*animations, run_time=0.8)
+        
+        # Re-seat each digit in the cell it now sits in
+        for j, digit in enumerate(shifted, start=pos):
+            self.array_mobjects[j].submobjects[1] = digit
+        self.array_values[pos + 1:current_pos + 1] = self.array_values[pos:current_pos]
         self.array_values[pos] = key
-        self.play(
-            self.array_mobjects[pos][1].animate.become(
-                Text(str(key), font_size=24, color=WHITE)
-                .move_to(self.array_mobjects[pos][1].get_center())
-            ),
-            run_time=0.5
-        )
     
     def highlight_sorted_portion(self, end_pos):
         # Briefly highlight the sorted portion
-        for i in range(end_pos):
-            self.play(self.array_mobjects[i][0].animate.set_fill(BLUE_C, 0.5), run_time=0.1)
+        self.play(*[self.array_mobjects[i][0].animate.set_fill(BLUE_C, 0.5) for i in range(end_pos)], run_time=0.2)
         self.wait(0.5)
-        for i in range(end_pos):
-            self.play(self.array_mobjects[i][0].animate.set_fill(BLUE, 0.3), run_time=0.1)
+        self.play(*[self.array_mobjects[i][0].animate.set_fill(BLUE, 0.3) for i in range(end_pos)], run_time=0.2)
 
 # Additional scene showing the algorithm complexity
 class BinaryInsertionSortComplexity(Scene):
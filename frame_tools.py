@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+Post-processing for extracted session frames.
+
+dedup collapses runs of near-identical consecutive frames (waits, slow
+fades, cards standing still) into their first frame. Frames are compared
+as small grayscale thumbnails, so decoding dominates and runs in a process
+pool. The kept frames and the time ranges they stand for are recorded in
+the session's manifest.json:
+
+    {"frame": "frame_0004.png", "last": "frame_0009.png", "count": 6, "start": 3.0, "end": 9.0}
+
+diff compares two sessions of a scene frame by frame, or by the end state
+of each animation, and writes a heatmap of every changed frame plus
+report.json to analysis/diff_vs_<other session>/ of the newer session, so
+only changed frames need reviewing.
+
+bundle packs all frames of a session into frames.npy, one uint8
+(frames, height, width, 3) array that analysis code memory-maps with
+load_bundle() instead of decoding PNGs, and contact-sheets tiles them into
+contact_sheets/sheet_NNN.png, 6x6 labelled thumbnails per sheet.
+
+Usage (needs numpy and Pillow, e.g. through poetry):
+    poetry run python frame_tools.py dedup renders/session_YYYYMMDD_HHMMSS --fps 30
+    poetry run python frame_tools.py diff renders/session_A renders/session_B [--align animation]
+    poetry run python frame_tools.py bundle renders/session_YYYYMMDD_HHMMSS
+    poetry run python frame_tools.py contact-sheets renders/session_YYYYMMDD_HHMMSS [--grid 6x6]
+"""
+
+import argparse
+import bisect
+import filecmp
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from render_catalog import FRAME_SUFFIXES
+
+MANIFEST_FILE = "manifest.json"
+SIGNATURE_SIZE = (128, 72)
+# Largest thumbnail pixel change (0-255) still counted as the same frame;
+# encoder noise stays well below it, a moved card or changed label doesn't
+DEFAULT_THRESHOLD = 8
+# A pixel counts as changed when a channel moves by more than this (0-255),
+# and a frame when more than MIN_CHANGED_PIXELS of its pixels do
+PIXEL_TOLERANCE = 24
+MIN_CHANGED_PIXELS = 16
+BUNDLE_FILE = "frames.npy"
+BUNDLE_INDEX_FILE = "frames.json"
+CONTACT_SHEET_DIR = "contact_sheets"
+THUMBNAIL_WIDTH = 256
+LABEL_HEIGHT = 16
+
+def session_frames(frames_dir):
+    """Sorted frame images in frames_dir."""
+    return sorted(path for path in Path(frames_dir).glob("frame_*") if path.suffix in FRAME_SUFFIXES)
+
+def frame_signature(path):
+    """Downsampled grayscale version of a frame as an int16 array."""
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image.draft("L", SIGNATURE_SIZE)
+        thumbnail = image.convert("L").resize(SIGNATURE_SIZE, Image.Resampling.BOX)
+    return np.asarray(thumbnail, dtype=np.int16)
+
+def frame_signatures(frames, workers=None):
+    """Signatures of all frames, decoded in parallel."""
+    workers = max(1, min(workers or os.cpu_count() or 1, len(frames)))
+    if workers == 1:
+        return [frame_signature(frame) for frame in frames]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(frame_signature, frames, chunksize=max(1, len(frames) // (workers * 4))))
+
+def duplicate_runs(signatures, threshold=DEFAULT_THRESHOLD):
+    """Split frame positions into runs that match the run's first frame.
+
+    Each frame is compared with the first frame of the current run rather
+    than its neighbour, so a slow fade still starts a new run once it has
+    drifted far enough. Returns inclusive (first, last) position pairs.
+    """
+    runs = []
+    for position, signature in enumerate(signatures):
+        if runs and np.abs(signature - signatures[runs[-1][0]]).max() <= threshold:
+            runs[-1][1] = position
+        else:
+            runs.append([position, position])
+    return [tuple(run) for run in runs]
+
+def dedup_frames(session_dir, fps=None, threshold=DEFAULT_THRESHOLD, workers=None):
+    """Delete repeated frames from a session and write manifest.json.
+
+    With fps (video sessions) each kept frame gets the start and end time
+    in seconds of the run it stands for. Returns the manifest.
+    """
+    session_dir = Path(session_dir)
+    frames = session_frames(session_dir / "frames")
+    runs = duplicate_runs(frame_signatures(frames, workers), threshold)
+
+    entries = []
+    for first, last in runs:
+        entry = {"frame": frames[first].name, "last": frames[last].name, "count": last - first + 1}
+        if fps:
+            entry.update(start=round(first / fps, 3), end=round((last + 1) / fps, 3))
+        entries.append(entry)
+        for duplicate in frames[first + 1:last + 1]:
+            duplicate.unlink()
+
+    manifest = {"fps": fps, "threshold": threshold, "extracted": len(frames), "kept": len(entries),
+                "frames": entries}
+    (session_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+    print(f"Dedup: kept {len(entries)} of {len(frames)} frames")
+    return manifest
+
+def frame_number(path):
+    """Frame number of a video frame, or animation number of a snapshot."""
+    return int(path.stem.split("_")[1])
+
+def frame_lookup(session_dir):
+    """Return a function mapping a frame number to the frame shown at it.
+
+    Deduplicated sessions keep only the first frame of each run, which
+    stands for the rest of the run, so the nearest kept frame at or before
+    the number is used. Numbers past the session's end give None.
+    """
+    frames = session_frames(Path(session_dir) / "frames")
+    numbers = [frame_number(frame) for frame in frames]
+    manifest_file = Path(session_dir) / MANIFEST_FILE
+    last = json.loads(manifest_file.read_text())["extracted"] if manifest_file.exists() else max(numbers, default=0)
+
+    def lookup(number):
+        position = bisect.bisect_right(numbers, number) - 1
+        if number > last or position < 0:
+            return None
+        return frames[position]
+    return lookup
+
+def animation_end_frames(session_dir):
+    """Map animation number -> frame number of its end state.
+
+    Snapshot sessions have one frame per animation already. Video sessions
+    need the animations.json timeline that --segments and --section renders
+    write; the end state is the last frame before the animation finishes.
+    The timeline covers the whole scene, so a --section video is timed
+    from the section's first animation.
+    """
+    session_dir = Path(session_dir)
+    telemetry = json.loads((session_dir / "telemetry.json").read_text())
+    if telemetry.get("mode") == "snapshots":
+        return {frame_number(frame): frame_number(frame) for frame in session_frames(session_dir / "frames")}
+
+    timeline = session_dir / "animations.json"
+    if not timeline.exists():
+        raise ValueError(f"{session_dir} has no animations.json; render with --segments or --snapshots, "
+                         "or align by frame")
+    records = json.loads(timeline.read_text())
+    if telemetry.get("section") is not None:
+        # The same range render_and_analyze.section_range() rendered
+        indices = [record["index"] for record in records if record["section"] == telemetry["section"]]
+        if not indices:
+            raise ValueError(f"{session_dir}: section {telemetry['section']!r} is not in animations.json")
+        records = [record for record in records if min(indices) <= record["index"] <= max(indices)]
+    elapsed, ends = 0.0, {}
+    for record in records:
+        elapsed += record["run_time"]
+        ends[record["index"]] = max(1, round(elapsed * telemetry["fps"]))
+    return ends
+
+def aligned_pairs(before_dir, after_dir, align="frame"):
+    """Pair up the frames of two sessions.
+
+    Returns (key, before frame, after frame) triples, where key is the
+    frame or animation number and a missing side is None.
+    """
+    before, after = frame_lookup(before_dir), frame_lookup(after_dir)
+    if align == "animation":
+        before_ends, after_ends = animation_end_frames(before_dir), animation_end_frames(after_dir)
+        keys = sorted(set(before_ends) | set(after_ends))
+        return [(key,
+                 before(before_ends[key]) if key in before_ends else None,
+                 after(after_ends[key]) if key in after_ends else None)
+                for key in keys]
+
+    numbers = {frame_number(frame) for session in (before_dir, after_dir)
+               for frame in session_frames(Path(session) / "frames")}
+    return [(key, before(key), after(key)) for key in sorted(numbers)]
+
+def diff_frames(before, after, heatmap_file, tolerance=PIXEL_TOLERANCE):
+    """Compare two frames; write a heatmap and return the change, or None if they match.
+
+    The heatmap is the new frame in dim grayscale with the changed pixels
+    in red, brighter the bigger the change.
+    """
+    from PIL import Image
+
+    # Identical files (often hardlinks, see render_catalog.py) need no decoding
+    if filecmp.cmp(before, after, shallow=False):
+        return None
+    with Image.open(before) as image:
+        old = np.asarray(image.convert("RGB"), dtype=np.int16)
+    with Image.open(after) as image:
+        new = np.asarray(image.convert("RGB"), dtype=np.int16)
+    if old.shape != new.shape:
+        return {"reason": "size", "before_size": list(old.shape[1::-1]), "after_size": list(new.shape[1::-1])}
+
+    delta = np.abs(new - old).max(axis=2)
+    changed = delta > tolerance
+    count = int(changed.sum())
+    if count <= MIN_CHANGED_PIXELS:
+        return None
+
+    rows, columns = np.nonzero(changed)
+    heatmap = (new.mean(axis=2, keepdims=True) * 0.35).repeat(3, axis=2)
+    heatmap[changed, 0] = 90 + delta[changed] * 165 / 255
+    Image.fromarray(heatmap.astype(np.uint8)).save(heatmap_file)
+    return {
+        "reason": "pixels",
+        "changed_pixels": count,
+        "fraction": round(count / changed.size, 5),
+        "max_diff": int(delta.max()),
+        "bbox": [int(columns.min()), int(rows.min()), int(columns.max()), int(rows.max())],
+        "heatmap": Path(heatmap_file).name,
+    }
+
+def diff_pair(job):
+    """Process-pool entry point: diff one aligned pair."""
+    key, before, after, heatmap_file, tolerance = job
+    if before is None or after is None:
+        return {"key": key, "reason": "missing",
+                "before": before.name if before else None, "after": after.name if after else None}
+    change = diff_frames(before, after, heatmap_file, tolerance)
+    if change is None:
+        return None
+    return {"key": key, "before": before.name, "after": after.name, **change}
+
+def diff_sessions(before_dir, after_dir, align="frame", tolerance=PIXEL_TOLERANCE, workers=None):
+    """Compare two sessions and write heatmaps and report.json for the changed frames.
+
+    The output goes to analysis/diff_vs_<before session>/ inside after_dir.
+    Returns the report.
+    """
+    before_dir, after_dir = Path(before_dir), Path(after_dir)
+    pairs = aligned_pairs(before_dir, after_dir, align)
+    output_dir = after_dir / "analysis" / f"diff_vs_{before_dir.name}"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs = [(key, before, after, output_dir / f"heatmap_{align}_{key:04d}.png", tolerance)
+            for key, before, after in pairs]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    if workers == 1:
+        results = [diff_pair(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(diff_pair, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    changed = [result for result in results if result]
+
+    report = {"before": str(before_dir), "after": str(after_dir), "align": align, "pixel_tolerance": tolerance,
+              "compared": len(pairs), "changed": changed}
+    (output_dir / "report.json").write_text(json.dumps(report, indent=2))
+
+    print(f"{len(changed)} of {len(pairs)} {align}s changed from {before_dir.name} to {after_dir.name}")
+    for change in changed:
+        detail = (f"{change['changed_pixels']} pixels, bbox {change['bbox']}" if change["reason"] == "pixels"
+                  else change["reason"])
+        print(f"  {align} {change['key']}: {change['before'] or '-'} -> {change['after'] or '-'} ({detail})")
+    print(f"Report: {output_dir / 'report.json'}")
+    return report
+
+def frame_labels(session_dir, frames):
+    """Short label per frame: its time in the video, or its animation for snapshots.
+
+    Frames kept by dedup show the whole time range they stand for.
+    """
+    session_dir = Path(session_dir)
+    telemetry_file = session_dir / "telemetry.json"
+    telemetry = json.loads(telemetry_file.read_text()) if telemetry_file.exists() else {}
+    manifest_file = session_dir / MANIFEST_FILE
+    runs = {}
+    if manifest_file.exists():
+        runs = {entry["frame"]: entry for entry in json.loads(manifest_file.read_text())["frames"]}
+
+    labels = []
+    for frame in frames:
+        if telemetry.get("mode") == "snapshots":
+            _, number, kind = frame.stem.split("_")
+            labels.append(f"animation {int(number)} {kind}")
+        elif "start" in runs.get(frame.name, {}):
+            labels.append(f"{runs[frame.name]['start']:.2f}-{runs[frame.name]['end']:.2f}s")
+        elif telemetry.get("fps"):
+            labels.append(f"{(frame_number(frame) - 1) / telemetry['fps']:.2f}s")
+        else:
+            labels.append(frame.stem)
+    return labels
+
+def load_frame(path):
+    """A frame as a (height, width, 3) uint8 array."""
+    from PIL import Image
+
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGB"))
+
+def fill_bundle(job):
+    """Process-pool entry point: decode a run of frames into the bundle."""
+    bundle_file, start, frames = job
+    bundle = np.load(bundle_file, mmap_mode="r+")
+    for offset, frame in enumerate(frames):
+        bundle[start + offset] = load_frame(frame)
+    bundle.flush()
+
+def write_bundle(session_dir, workers=None):
+    """Pack the session's frames into frames.npy plus a frames.json index.
+
+    The array is created on disk and filled by a process pool, each worker
+    decoding a run of frames straight into its slice, so neither the
+    workers nor this process hold the whole bundle in memory. Returns the
+    bundle path, or None when the session has no frames.
+    """
+    session_dir = Path(session_dir)
+    frames = session_frames(session_dir / "frames")
+    if not frames:
+        return None
+
+    height, width, _ = load_frame(frames[0]).shape
+    bundle_file = session_dir / BUNDLE_FILE
+    bundle = np.lib.format.open_memmap(bundle_file, mode="w+", dtype=np.uint8,
+                                       shape=(len(frames), height, width, 3))
+    del bundle
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(frames)))
+    step = -(-len(frames) // (workers * 4))
+    jobs = [(bundle_file, start, frames[start:start + step]) for start in range(0, len(frames), step)]
+    if workers == 1:
+        for job in jobs:
+            fill_bundle(job)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(fill_bundle, jobs))
+
+    index = {"frames": [frame.name for frame in frames], "labels": frame_labels(session_dir, frames),
+             "shape": [len(frames), height, width, 3]}
+    (session_dir / BUNDLE_INDEX_FILE).write_text(json.dumps(index, indent=2))
+    size_mb = len(frames) * height * width * 3 / 1024 / 1024
+    print(f"Bundle: {len(frames)} frames of {width}x{height} in {bundle_file} ({size_mb:.0f} MB)")
+    return bundle_file
+
+def load_bundle(session_dir):
+    """Memory-map a session's frames.npy; return (array, index).
+
+    Slicing the array reads only the frames used, e.g. bundle[10:20].
+    """
+    session_dir = Path(session_dir)
+    index = json.loads((session_dir / BUNDLE_INDEX_FILE).read_text())
+    return np.load(session_dir / BUNDLE_FILE, mmap_mode="r"), index
+
+def draw_contact_sheet(job):
+    """Process-pool entry point: tile one sheet of thumbnails with their labels."""
+    from PIL import Image, ImageDraw
+
+    sheet_file, sources, labels, columns, thumbnail_size = job
+    width, height = thumbnail_size
+    rows = -(-len(sources) // columns)
+    sheet = Image.new("RGB", (columns * width, rows * (height + LABEL_HEIGHT)), (32, 32, 32))
+    draw = ImageDraw.Draw(sheet)
+    bundle = None
+    for position, (source, label) in enumerate(zip(sources, labels)):
+        if isinstance(source, tuple):  # (bundle file, index) from frames.npy
+            if bundle is None:
+                bundle = np.load(source[0], mmap_mode="r")
+            image = Image.fromarray(np.asarray(bundle[source[1]]))
+        else:
+            image = Image.open(source).convert("RGB")
+        image.thumbnail(thumbnail_size)
+        x, y = position % columns * width, position // columns * (height + LABEL_HEIGHT)
+        sheet.paste(image, (x, y))
+        draw.text((x + 4, y + height + 2), label, fill=(230, 230, 230))
+    sheet.save(sheet_file)
+    return sheet_file
+
+def write_contact_sheets(session_dir, columns=6, rows=6, thumbnail_width=THUMBNAIL_WIDTH, workers=None):
+    """Tile the session's frames into labelled contact sheets, columns x rows per sheet.
+
+    Thumbnails are cut from frames.npy when the session has a bundle.
+    Returns the sheet paths.
+    """
+    session_dir = Path(session_dir)
+    frames = session_frames(session_dir / "frames")
+    if not frames:
+        return []
+    labels = frame_labels(session_dir, frames)
+
+    bundle_file = session_dir / BUNDLE_FILE
+    if bundle_file.exists() and (session_dir / BUNDLE_INDEX_FILE).exists():
+        _, height, width, _ = json.loads((session_dir / BUNDLE_INDEX_FILE).read_text())["shape"]
+        sources = [(bundle_file, position) for position in range(len(frames))]
+    else:
+        height, width, _ = load_frame(frames[0]).shape
+        sources = frames
+    thumbnail_size = (thumbnail_width, round(thumbnail_width * height / width))
+
+    sheet_dir = session_dir / CONTACT_SHEET_DIR
+    sheet_dir.mkdir(exist_ok=True)
+    per_sheet = columns * rows
+    jobs = [(sheet_dir / f"sheet_{start // per_sheet + 1:03d}.png", sources[start:start + per_sheet],
+             labels[start:start + per_sheet], columns, thumbnail_size)
+            for start in range(0, len(frames), per_sheet)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    if workers == 1:
+        sheets = [draw_contact_sheet(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            sheets = list(pool.map(draw_contact_sheet, jobs))
+
+    print(f"Contact sheets: {len(sheets)} in {sheet_dir}")
+    return sheets
+
+def main():
+    """Run a frame post-processing step on session directories."""
+    parser = argparse.ArgumentParser(description="Post-process the frames of render sessions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    dedup = commands.add_parser("dedup", help="drop near-identical consecutive frames")
+    dedup.add_argument("session_dir")
+    dedup.add_argument("--fps", type=int, help="frame rate the frames were extracted at")
+    dedup.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help=f"largest thumbnail pixel change treated as a duplicate (default: {DEFAULT_THRESHOLD})")
+    dedup.add_argument("--workers", type=int)
+    diff = commands.add_parser("diff", help="find the frames that changed between two sessions")
+    diff.add_argument("before_dir")
+    diff.add_argument("after_dir")
+    diff.add_argument("--align", choices=["frame", "animation"], default="frame",
+                      help="pair frames by number, or by the end state of each animation")
+    diff.add_argument("--tolerance", type=int, default=PIXEL_TOLERANCE,
+                      help=f"channel change (0-255) below which a pixel counts as unchanged (default: {PIXEL_TOLERANCE})")
+    diff.add_argument("--workers", type=int)
+    bundle = commands.add_parser("bundle", help="pack the frames into one memory-mappable frames.npy")
+    bundle.add_argument("session_dir")
+    bundle.add_argument("--workers", type=int)
+    sheets = commands.add_parser("contact-sheets", help="tile the frames into labelled contact sheets")
+    sheets.add_argument("session_dir")
+    sheets.add_argument("--grid", default="6x6", metavar="COLUMNSxROWS")
+    sheets.add_argument("--width", type=int, default=THUMBNAIL_WIDTH, help="thumbnail width in pixels")
+    sheets.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    if args.command == "dedup":
+        dedup_frames(args.session_dir, args.fps, args.threshold, args.workers)
+        return
+    if args.command == "bundle":
+        if not write_bundle(args.session_dir, args.workers):
+            print(f"Error: no frames in {args.session_dir}")
+            raise SystemExit(1)
+        return
+    if args.command == "contact-sheets":
+        columns, _, rows = args.grid.partition("x")
+        if not write_contact_sheets(args.session_dir, int(columns), int(rows or columns), args.width, args.workers):
+            print(f"Error: no frames in {args.session_dir}")
+            raise SystemExit(1)
+        return
+
+    try:
+        diff_sessions(args.before_dir, args.after_dir, args.align, args.tolerance, args.workers)
+    except ValueError as error:
+        print(f"Error: {error}")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
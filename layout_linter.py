@@ -0,0 +1,166 @@
+"""
+Geometry-based layout linter.
+
+Checks the scene graph at the end of every play() for overlapping objects,
+objects that stick out of the frame and text that ends up too small,
+using bounding boxes instead of rendered frames. Runs on the null
+renderer (see scene_runner.lint_scene), so nothing is rasterized or
+encoded.
+"""
+
+import json
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+MIN_FONT_SIZE = 12
+# Overlaps and overhangs smaller than this (scene units) are ignored
+TOLERANCE = 0.02
+# Stacked card lists overlap by design
+IGNORED_OVERLAPS = {("card", "card")}
+
+def is_card(mobject):
+    """A group drawn as a container rectangle with its content inside."""
+    from manim import Polygram, VGroup
+
+    if type(mobject) is not VGroup or len(mobject.submobjects) < 2:
+        return False
+    container = mobject.submobjects[0]
+    if not isinstance(container, Polygram):
+        return False
+    inner = VGroup(*mobject.submobjects[1:])
+    return (container.get_left()[0] <= inner.get_left()[0] + TOLERANCE
+            and container.get_right()[0] >= inner.get_right()[0] - TOLERANCE
+            and container.get_bottom()[1] <= inner.get_bottom()[1] + TOLERANCE
+            and container.get_top()[1] >= inner.get_top()[1] - TOLERANCE)
+
+def layout_units(mobjects):
+    """Split the scene into the objects whose boxes are compared.
+
+    Plain groups are opened up, except cards, which are checked as one
+    unit because their content sits inside the container on purpose.
+    """
+    from manim import Group, VGroup
+
+    units = []
+    for mobject in mobjects:
+        if type(mobject) in (VGroup, Group) and not is_card(mobject):
+            units += layout_units(mobject.submobjects)
+        elif len(mobject.get_all_points()):
+            units.append(mobject)
+    return units
+
+def category(mobject):
+    """Coarse kind of a unit, used in reports and IGNORED_OVERLAPS."""
+    from manim import Arrow, Brace, Text
+
+    if isinstance(mobject, Text):
+        return "text"
+    if isinstance(mobject, Brace):
+        return "brace"
+    if isinstance(mobject, Arrow):
+        return "arrow"
+    if is_card(mobject):
+        return "card"
+    return "shape"
+
+def describe(mobject):
+    """Short human-readable name, e.g. card "Train new volunteers"."""
+    from manim import Text
+
+    texts = [member.text for member in mobject.get_family() if isinstance(member, Text)]
+    kind = category(mobject)
+    if texts:
+        return f'{kind} "{" ".join(texts)[:40]}"'
+    return f"{kind} {type(mobject).__name__}"
+
+def bounding_boxes(units):
+    """(n, 4) array of xmin, ymin, xmax, ymax per unit."""
+    boxes = np.empty((len(units), 4))
+    for row, unit in enumerate(units):
+        points = unit.get_all_points()
+        boxes[row, :2] = points[:, :2].min(axis=0)
+        boxes[row, 2:] = points[:, :2].max(axis=0)
+    return boxes
+
+def overlapping_pairs(boxes, tolerance=TOLERANCE):
+    """Index pairs (i < j) whose boxes overlap by more than tolerance both ways, with the overlap area."""
+    width = np.minimum(boxes[:, None, 2], boxes[None, :, 2]) - np.maximum(boxes[:, None, 0], boxes[None, :, 0])
+    height = np.minimum(boxes[:, None, 3], boxes[None, :, 3]) - np.maximum(boxes[:, None, 1], boxes[None, :, 1])
+    overlaps = np.triu((width > tolerance) & (height > tolerance), k=1)
+    return [(i, j, float(width[i, j] * height[i, j])) for i, j in zip(*np.nonzero(overlaps))]
+
+def contains(outer, inner, tolerance=TOLERANCE):
+    """Whether box outer encloses box inner."""
+    return (outer[0] <= inner[0] + tolerance and outer[1] <= inner[1] + tolerance
+            and outer[2] >= inner[2] - tolerance and outer[3] >= inner[3] - tolerance)
+
+def is_outline(mobject):
+    """Unfilled shapes (highlight boxes) are meant to surround other objects."""
+    return all(member.get_fill_opacity() == 0 for member in mobject.get_family() if len(member.points))
+
+def lint_state(scene, index, min_font_size=MIN_FONT_SIZE):
+    """Return the layout issues in the scene's current state."""
+    from manim import Text, config
+
+    issues = []
+    units = layout_units(scene.mobjects)
+    if not units:
+        return issues
+    boxes = bounding_boxes(units)
+
+    for i, j, area in overlapping_pairs(boxes):
+        kinds = tuple(sorted((category(units[i]), category(units[j]))))
+        if kinds in IGNORED_OVERLAPS:
+            continue
+        if (contains(boxes[i], boxes[j]) and is_outline(units[i])) or \
+                (contains(boxes[j], boxes[i]) and is_outline(units[j])):
+            continue
+        issues.append({"animation": index, "issue": "overlap",
+                       "objects": [describe(units[i]), describe(units[j])], "area": round(area, 3)})
+
+    half_width, half_height = config.frame_width / 2, config.frame_height / 2
+    overhang = np.maximum.reduce([
+        -half_width - boxes[:, 0], -half_height - boxes[:, 1],
+        boxes[:, 2] - half_width, boxes[:, 3] - half_height,
+    ])
+    for row in np.nonzero(overhang > TOLERANCE)[0]:
+        issues.append({"animation": index, "issue": "out_of_frame",
+                       "objects": [describe(units[row])], "overhang": round(float(overhang[row]), 3)})
+
+    for mobject in scene.mobjects:
+        for member in mobject.get_family():
+            if isinstance(member, Text) and member.text.strip() and member.font_size < min_font_size:
+                issues.append({"animation": index, "issue": "small_text",
+                               "objects": [describe(member)], "font_size": round(float(member.font_size), 1)})
+    return issues
+
+def layout_linter(issues, min_font_size=MIN_FONT_SIZE):
+    """Return an after_play hook that lints every play() end state into issues."""
+    def lint(scene, kind):
+        if kind == "play":
+            issues.extend(lint_state(scene, scene.renderer.num_plays - 1, min_font_size))
+    return lint
+
+def write_report(issues, path):
+    """Save the issues as JSON and print them grouped by problem."""
+    grouped = defaultdict(list)
+    for issue in issues:
+        grouped[(issue["issue"], tuple(issue["objects"]))].append(issue["animation"])
+
+    report = {
+        "issues": issues,
+        "summary": [{"issue": kind, "objects": list(objects), "animations": animations}
+                    for (kind, objects), animations in grouped.items()],
+    }
+    Path(path).write_text(json.dumps(report, indent=2))
+
+    if not issues:
+        print("✓ No layout issues")
+        return
+    print(f"{len(grouped)} layout issue(s) across {len({issue['animation'] for issue in issues})} animations:")
+    for (kind, objects), animations in sorted(grouped.items(), key=lambda item: item[1][0]):
+        shown = ", ".join(str(number) for number in animations[:8])
+        more = f" (+{len(animations) - 8} more)" if len(animations) > 8 else ""
+        print(f"  ⚠ {kind}: {' / '.join(objects)} at animations {shown}{more}")
@@ -0,0 +1,172 @@
+"""
+Shared cache of manim's reusable render work.
+
+manim names text SVGs, LaTeX output and partial movie files after a hash
+of what produced them, so the files are content-addressed already. They
+normally live under a media directory that render_and_analyze.py throws
+away with each session; this module keeps them in one directory that
+every session, segment and worker shares:
+
+    renders/.cache/media/texts/<hash>.svg
+    renders/.cache/media/Tex/<hash>.svg
+    renders/.cache/media/partial_movies/<quality dir>-<codec>/<hash>.mp4
+
+Before a render, seed() hardlinks the cache into the fresh media directory
+so manim finds the files and skips that work; afterwards publish() adds
+what's new. Entries are written to a temporary name and renamed into
+place, so concurrent renders never see a partial file, and evict() keeps
+the cache under a size limit, least recently used first. This replaces
+manim's max_files_cached count limit, which is set to -1 (unlimited) in
+the configs because per-session media directories don't outlive the
+session anyway.
+
+The size limit is read from the config files:
+
+    [media_cache]
+    max_size_mb = 2048    # 0 disables the cache
+"""
+
+import configparser
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+CACHE_DIR = Path("renders") / ".cache" / "media"
+DEFAULT_MAX_SIZE_MB = 2048
+# Flat directories of hash-named files under manim's media_dir
+TEXT_DIRS = ("texts", "Tex")
+MOVIE_SUFFIXES = (".mp4", ".mov", ".webm")
+# Temporary files older than this were left behind by a crashed render
+STALE_TMP_SECONDS = 3600
+
+def read_config(config_file=None):
+    """manim.cfg overlaid with config_file, the way manim reads them."""
+    parser = configparser.ConfigParser()
+    parser.read([path for path in ("manim.cfg", config_file) if path])
+    return parser
+
+def max_cache_bytes(config_file=None):
+    """Size limit of the cache from [media_cache] max_size_mb."""
+    size_mb = read_config(config_file).getfloat("media_cache", "max_size_mb", fallback=DEFAULT_MAX_SIZE_MB)
+    return int(size_mb * 1024 * 1024)
+
+def movie_bucket(quality_dir, config_file=None):
+    """Cache directory for partial movies that can be joined with each other.
+
+    Partial movies are only interchangeable at the same resolution, frame
+    rate and codec, since manim joins them without re-encoding.
+    """
+    codec = read_config(config_file).get("ffmpeg", "video_codec", fallback="libx264")
+    return CACHE_DIR / "partial_movies" / f"{quality_dir}-{codec}"
+
+def cacheable_movies(partial_dir):
+    """Partial movies in partial_dir named by content hash.
+
+    With caching disabled manim numbers them uncached_00000 etc. instead,
+    which must never be shared.
+    """
+    if not partial_dir.exists():
+        return []
+    return [path for path in partial_dir.iterdir()
+            if path.suffix in MOVIE_SUFFIXES and not path.name.startswith("uncached_")]
+
+def link_or_copy(src, dst):
+    """Hardlink src to dst, falling back to a copy across filesystems."""
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        raise
+    except OSError:
+        shutil.copy2(src, dst)
+
+def seed_dir(cache_dir, target_dir):
+    """Link every cache entry in cache_dir into target_dir; return how many."""
+    if not cache_dir.exists():
+        return 0
+    target_dir.mkdir(parents=True, exist_ok=True)
+    count = 0
+    for entry in cache_dir.iterdir():
+        if entry.name.startswith("."):
+            continue
+        try:
+            link_or_copy(entry, target_dir / entry.name)
+            # Reuse counts as use for eviction
+            os.utime(entry)
+        except FileExistsError:
+            continue
+        except FileNotFoundError:  # evicted by another process meanwhile
+            continue
+        count += 1
+    return count
+
+def publish_file(path, cache_dir):
+    """Atomically add one file to cache_dir unless an entry already exists."""
+    target = cache_dir / path.name
+    if target.exists():
+        return False
+    # Segments of one render publish from threads of the same process
+    tmp = cache_dir / f".{path.name}.tmp{os.getpid()}-{threading.get_ident()}"
+    tmp.unlink(missing_ok=True)
+    link_or_copy(path, tmp)
+    os.replace(tmp, target)
+    return True
+
+def seed(media_dir, partial_dir=None, bucket=None):
+    """Prepare a fresh media directory with everything the cache holds.
+
+    partial_dir is where manim looks for this scene's partial movies and
+    bucket the matching movie_bucket(); leave them out when no video is
+    written. Returns the number of files linked.
+    """
+    count = sum(seed_dir(CACHE_DIR / name, Path(media_dir) / name) for name in TEXT_DIRS)
+    if partial_dir and bucket:
+        count += seed_dir(bucket, Path(partial_dir))
+    return count
+
+def publish(media_dir, partial_dir=None, bucket=None):
+    """Add the text and partial-movie files a render produced; return how many were new."""
+    count = 0
+    for name in TEXT_DIRS:
+        source_dir = Path(media_dir) / name
+        if not source_dir.exists():
+            continue
+        cache_dir = CACHE_DIR / name
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        count += sum(publish_file(path, cache_dir) for path in source_dir.iterdir() if path.is_file())
+    if partial_dir and bucket:
+        movies = cacheable_movies(Path(partial_dir))
+        if movies:
+            bucket.mkdir(parents=True, exist_ok=True)
+            count += sum(publish_file(path, bucket) for path in movies)
+    return count
+
+def evict(max_bytes):
+    """Delete least recently used entries until the cache fits in max_bytes.
+
+    Files other processes have already linked stay usable for them, since
+    only the cache's own link is removed. Returns the bytes freed.
+    """
+    entries = []
+    for path in CACHE_DIR.rglob("*"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        if not path.is_file():
+            continue
+        if path.name.startswith("."):
+            if time.time() - stat.st_mtime > STALE_TMP_SECONDS:
+                path.unlink(missing_ok=True)
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    freed = 0
+    for _, size, path in sorted(entries):
+        if total - freed <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        freed += size
+    return freed
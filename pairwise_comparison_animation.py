@@ -1,13 +1,18 @@
 from manim import *
 import numpy as np
 
+from scene_datasets import DatasetMixin
+from sorting_trace import priority_chooser, split_insertions, trace_sort
+from text_cache import cached_lines, cached_text
+from timing_profiles import TimingProfileMixin
+
 # Define colors for better readability and to avoid NameError
 DARK_BLUE = '#2D6A9F'
 DARK_GREEN = '#3E8948'
 DARK_GRAY = '#A9A9A9'
 
 
-class PairwiseComparisonSort(Scene):
+class PairwiseComparisonSort(DatasetMixin, TimingProfileMixin, Scene):
     # Animation timing constants
     FAST_ANIMATION = 0.3
     MEDIUM_ANIMATION = 0.6
@@ -15,29 +20,49 @@ class PairwiseComparisonSort(Scene):
     SHORT_WAIT = 0.1
     MEDIUM_WAIT = 0.2
     LONG_WAIT = 0.4
+
+    # Lists longer than this are drawn as a window of WINDOW_SIZE cards around
+    # the search; hidden runs of cards collapse into "…N tasks…" rows
+    MAX_STACKED_CARDS = 8
+    WINDOW_SIZE = 5
+
+    # Sample tasks for animal welfare org
+    TASK_NAMES = [
+        "Review adoption applications",
+        "Schedule veterinary checkups",
+        "Update social media posts",
+        "Organize fundraising event",
+        "Train new volunteers",
+        "Clean animal enclosures",
+        "Process donation receipts",
+        "Respond to rescue requests"
+    ]
+    # Simulated user choices: higher priority number = more important
+    TASK_PRIORITIES = {
+        "Review adoption applications": 8,
+        "Schedule veterinary checkups": 9,
+        "Update social media posts": 3,
+        "Organize fundraising event": 6,
+        "Train new volunteers": 5,
+        "Clean animal enclosures": 7,
+        "Process donation receipts": 4,
+        "Respond to rescue requests": 10
+    }
+
     def construct(self):
         # Set light background for better contrast
         self.camera.background_color = WHITE
         # No title - more space for content
         pass
         
-        # Sample tasks for animal welfare org
-        self.task_names = [
-            "Review adoption applications",
-            "Schedule veterinary checkups", 
-            "Update social media posts",
-            "Organize fundraising event",
-            "Train new volunteers",
-            "Clean animal enclosures",
-            "Process donation receipts",
-            "Respond to rescue requests"
-        ]
+        self.task_names = list(self.TASK_NAMES)
         self.tasks = []
         
         # Create task cards
         for i, name in enumerate(self.task_names):
             task = self.create_task_card(name, i)
             self.tasks.append(task)
+        self.windowed = len(self.tasks) > self.MAX_STACKED_CARDS
         
         # Create all tasks and labels at once
         unsorted_label = Text("Unsorted Tasks", font_size=20, color=BLACK).move_to(LEFT * 4 + DOWN * 3.5)
@@ -45,11 +70,17 @@ class PairwiseComparisonSort(Scene):
         
         # Display unsorted tasks in a stacked column with proper spacing and staggering
         initial_animations = [Write(unsorted_label), Write(sorted_label)]
-        for i, task in enumerate(self.tasks):
+        # Long lists show one batch of unsorted cards at a time
+        self.unsorted_shown = self.MAX_STACKED_CARDS if self.windowed else len(self.tasks)
+        for i, task in enumerate(self.tasks[:self.unsorted_shown]):
             # Add slight staggering for visual separation
             x_offset = LEFT * 4 + LEFT * (i * 0.03)  # Reduced stagger to prevent overlap
             task.move_to(x_offset + UP * (2.1 - i * 0.55))  # Increased vertical spacing
             initial_animations.append(Create(task))
+        self.unsorted_more = None
+        if self.windowed:
+            self.unsorted_more = self.more_tasks_label(len(self.tasks) - self.unsorted_shown)
+            initial_animations.append(FadeIn(self.unsorted_more))
         
         self.play(*initial_animations, run_time=self.FAST_ANIMATION)
         
@@ -57,6 +88,11 @@ class PairwiseComparisonSort(Scene):
         self.sorted_tasks = []
         self.unsorted_tasks = list(range(len(self.tasks)))
         
+        # Windowed mode: sorted tasks drawn as cards, and the "…N tasks…" rows
+        self.visible_sorted = set()
+        self.gap_labels = []
+        self.window_focus = 0
+        
         # Initialize search bounds group as empty VGroup
         self.search_bounds_group = VGroup()
 
@@ -73,25 +109,20 @@ class PairwiseComparisonSort(Scene):
     
     def create_task_card(self, name, task_id):
         # Standardized text handling with consistent wrapping rules
+        # Text layouts come from the shared cache, so repeated names are laid out once
         words = name.split()
         if len(words) > 4:  # Very long names - split into 2 lines
             mid = len(words) // 2
             line1 = " ".join(words[:mid])
             line2 = " ".join(words[mid:])
-            text = VGroup(
-                Text(line1, font_size=140, color=BLACK).scale(0.1),
-                Text(line2, font_size=140, color=BLACK).scale(0.1)
-            ).arrange(DOWN, buff=0.15)
+            text = cached_lines([line1, line2], 140, BLACK, scale=0.1, buff=0.15)
         elif len(words) > 2:  # Medium names - try to break at natural point
             mid = len(words) // 2
             line1 = " ".join(words[:mid])
             line2 = " ".join(words[mid:])
-            text = VGroup(
-                Text(line1, font_size=150, color=BLACK).scale(0.1),
-                Text(line2, font_size=150, color=BLACK).scale(0.1)
-            ).arrange(DOWN, buff=0.15)
+            text = cached_lines([line1, line2], 150, BLACK, scale=0.1, buff=0.15)
         else:
-            text = Text(name, font_size=160, color=BLACK).scale(0.1)
+            text = cached_text(name, 160, BLACK, scale=0.1)
         
         # Create dynamic container based on text size with proper padding
         text_width = text.width
@@ -110,22 +141,123 @@ class PairwiseComparisonSort(Scene):
         
         return VGroup(rect, text)
     
+    def sort_trace(self):
+        """Run the whole sort up front with the simulated choices; the animation replays its trace"""
+        # Higher priority number = more important
+        priorities = {i: self.TASK_PRIORITIES.get(name, 5) for i, name in enumerate(self.task_names)}
+        return trace_sort(range(len(self.task_names)), priority_chooser(priorities))
+    
     def animate_pairwise_sorting(self):
+        first, *insertions = split_insertions(self.sort_trace())
+        
         # Move first task to sorted area with proper spacing
-        first_task = self.tasks[0]
+        first_task = self.tasks[first["item"]]
         self.play(first_task.animate.move_to(RIGHT * 4 + UP * 2.1), run_time=self.MEDIUM_ANIMATION)
-        self.sorted_tasks.append(0)
-        self.unsorted_tasks.remove(0)
+        self.sorted_tasks.append(first["item"])
+        self.unsorted_tasks.remove(first["item"])
+        self.visible_sorted.add(first["item"])
         
         # Process remaining tasks
-        for task_idx in range(1, len(self.tasks)):
-            self.insert_task_with_comparisons(task_idx)
+        for insertion in insertions:
+            # One section per insertion, so a single step can be rendered on its own
+            self.next_section(self.task_names[insertion["item"]])
+            if insertion["item"] >= self.unsorted_shown:
+                self.show_next_unsorted_batch(insertion["item"])
+            self.insert_task_with_comparisons(insertion)
             self.wait(self.MEDIUM_WAIT)
 
-        # Final stacking
-        self.stack_sorted_tasks()
+        # Final stacking, showing the top of the list
+        self.stack_sorted_tasks(focus=0)
+    
+    def more_tasks_label(self, count):
+        """Row standing in for count unsorted tasks that aren't drawn yet"""
+        return cached_text(f"…{count} more tasks…", 16, DARK_GRAY).move_to(LEFT * 4 + UP * (2.1 - self.MAX_STACKED_CARDS * 0.55))
     
-    def insert_task_with_comparisons(self, task_idx):
+    def show_next_unsorted_batch(self, first):
+        """Fill the emptied unsorted column with the next batch of cards"""
+        end = min(len(self.tasks), first + self.MAX_STACKED_CARDS)
+        animations = []
+        for slot, task in enumerate(self.tasks[first:end]):
+            task.move_to(LEFT * 4 + LEFT * (slot * 0.03) + UP * (2.1 - slot * 0.55))
+            animations.append(FadeIn(task))
+        
+        remaining = len(self.tasks) - end
+        if remaining:
+            new_label = self.more_tasks_label(remaining)
+            animations.append(ReplacementTransform(self.unsorted_more, new_label))
+            self.unsorted_more = new_label
+        else:
+            animations.append(FadeOut(self.unsorted_more))
+            self.unsorted_more = None
+        
+        self.unsorted_shown = end
+        self.play(*animations, run_time=self.FAST_ANIMATION)
+    
+    def window_animations(self, focus, left=0, right=0):
+        """Animations that redraw the sorted list as a window around sorted position focus.
+        
+        Cards inside the window move to their rows, cards entering it fade in
+        and cards leaving it fade out, so the work is bounded by WINDOW_SIZE
+        rather than the list length. Hidden runs are split at the search bounds
+        left/right so braces over the search range can cover them.
+        """
+        n = len(self.sorted_tasks)
+        start = max(0, min(focus - self.WINDOW_SIZE // 2, n - self.WINDOW_SIZE))
+        end = min(n, start + self.WINDOW_SIZE)
+        self.window_focus = focus
+        
+        def hidden_runs(low, high):
+            cuts = sorted({low, high} | {bound for bound in (left, right) if low < bound < high})
+            return [("gap", run) for run in zip(cuts, cuts[1:])]
+        
+        rows = hidden_runs(0, start) + [("card", i) for i in range(start, end)] + hidden_runs(end, n)
+        
+        animations = []
+        visible = set()
+        gap_labels = []
+        y = 2.1
+        for row, (kind, value) in enumerate(rows):
+            target = RIGHT * 4 + RIGHT * (row * 0.03) + UP * y
+            if kind == "card":
+                task_idx = self.sorted_tasks[value]
+                task = self.tasks[task_idx]
+                visible.add(task_idx)
+                task.set_z_index(n - value)
+                if task in self.mobjects:
+                    animations.append(task.animate.move_to(target))
+                else:
+                    task.move_to(target)
+                    task[0].set_stroke(BLACK, 1)
+                    animations.append(FadeIn(task))
+                y -= 0.62
+            else:
+                low, high = value
+                label = cached_text(f"…{high - low} tasks…", 16, DARK_GRAY).move_to(target)
+                label.sorted_range = value
+                gap_labels.append(label)
+                y -= 0.4
+        
+        for task_idx in self.visible_sorted - visible:
+            animations.append(FadeOut(self.tasks[task_idx]))
+        for old_label, new_label in zip(self.gap_labels, gap_labels):
+            animations.append(ReplacementTransform(old_label, new_label))
+        animations += [FadeOut(label) for label in self.gap_labels[len(gap_labels):]]
+        animations += [FadeIn(label) for label in gap_labels[len(self.gap_labels):]]
+        
+        self.visible_sorted = visible
+        self.gap_labels = gap_labels
+        return animations
+    
+    def search_range_mobjects(self, left, right):
+        """Everything drawn for sorted positions left..right-1: cards, plus hidden-run rows when windowed"""
+        if not self.windowed:
+            return VGroup(*[self.tasks[self.sorted_tasks[i]] for i in range(left, right)])
+        cards = [self.tasks[self.sorted_tasks[i]] for i in range(left, right) if self.sorted_tasks[i] in self.visible_sorted]
+        gaps = [label for label in self.gap_labels if left <= label.sorted_range[0] and label.sorted_range[1] <= right]
+        return VGroup(*cards, *gaps)
+    
+    def insert_task_with_comparisons(self, insertion):
+        task_idx = insertion["item"]
         current_task = self.tasks[task_idx]
         
         # Show that we're inserting this task
@@ -136,53 +268,28 @@ class PairwiseComparisonSort(Scene):
         insertion_text.move_to(UP * 3.7)
         self.play(Write(insertion_text), run_time=self.MEDIUM_ANIMATION)
         
-        # Binary search to find insertion position
-        left, right = 0, len(self.sorted_tasks)
+        # Replay the binary search from the trace; search bounds are shown as
+        # the half-open range left..right-1 of sorted positions
+        comparisons = insertion["comparisons"]
         comparison_count = 0
-        choice = None
         last_compared_task = None
         
-        while left < right:
-            mid = (left + right) // 2
+        for comparison in comparisons:
+            left, right, mid = comparison["low"], comparison["high"] + 1, comparison["mid"]
             comparison_count += 1
             
             # Show search bounds
             self.show_search_bounds(left, right, mid)
             
-            # Simulate user choice with more realistic priority ordering
-            # Use task content to determine priority for demo
-            priorities = {
-                "Review adoption applications": 8,
-                "Schedule veterinary checkups": 9, 
-                "Update social media posts": 3,
-                "Organize fundraising event": 6,
-                "Train new volunteers": 5,
-                "Clean animal enclosures": 7,
-                "Process donation receipts": 4,
-                "Respond to rescue requests": 10
-            }
-            
-            current_priority = priorities.get(self.task_names[task_idx], 5)
-            mid_priority = priorities.get(self.task_names[self.sorted_tasks[mid]], 5)
-            
-            if current_priority > mid_priority:  # Higher priority number = more important
+            choice = comparison["choice"]
+            if choice == "A":  # Current task is more important: search above mid
                 right = mid
-                choice = "A"
-            else:  # Lower priority
-                left = mid + 1
-                choice = "B"
-
-            # Check if this will be the final comparison
-            next_left = left
-            next_right = right
-            if current_priority > mid_priority:
-                next_right = mid
             else:
-                next_left = mid + 1
-            is_final_comparison = (next_left >= next_right)
+                left = mid + 1
+            is_final_comparison = comparison_count == len(comparisons)
             
             # Show the comparison
-            last_compared_task = self.sorted_tasks[mid]
+            last_compared_task = comparison["b"]
             comparison_title_obj, task_a_obj, task_b_obj = self.show_comparison(task_idx, last_compared_task, comparison_count, choice, is_final_comparison)
             
             # Show the choice result
@@ -206,7 +313,7 @@ class PairwiseComparisonSort(Scene):
                 else:
                     explanation_text_content = f"B > A\nSearch right half"
 
-                explanation_text = Text(explanation_text_content, font_size=18, color=DARK_BLUE).move_to(LEFT * 3 + UP * 0.5)
+                explanation_text = cached_text(explanation_text_content, 18, DARK_BLUE).move_to(LEFT * 3 + UP * 0.5)
                 
                 # Arrow from comparison area to search bounds
                 explanation_arrow = Arrow(explanation_text.get_right(), self.search_bounds_group[2].get_left(), color=DARK_BLUE)
@@ -224,7 +331,7 @@ class PairwiseComparisonSort(Scene):
         # Keep search bounds visible during final positioning
         
         # Final comparison completed - show both tasks stacked and move them together
-        self.show_final_positioning(task_idx, left, comparison_count > 0, last_compared_task)
+        self.show_final_positioning(task_idx, insertion["index"], comparison_count > 0, last_compared_task)
         
         # Clean up
         self.play(FadeOut(insertion_text))
@@ -235,6 +342,10 @@ class PairwiseComparisonSort(Scene):
     
     def spread_search_range(self, left, right):
         """Spread out only the tasks in the search range for better visibility"""
+        if self.windowed:
+            self.play(*self.window_animations((left + right) // 2, left, right), run_time=self.MEDIUM_ANIMATION)
+            return
+        
         animations = []
         for i, sorted_task_idx in enumerate(self.sorted_tasks):
             task = self.tasks[sorted_task_idx]
@@ -255,8 +366,13 @@ class PairwiseComparisonSort(Scene):
         if animations:
             self.play(*animations, run_time=self.MEDIUM_ANIMATION)
     
-    def stack_sorted_tasks(self):
+    def stack_sorted_tasks(self, focus=None):
         """Return all sorted tasks to stacked positions"""
+        if self.windowed:
+            focus = self.window_focus if focus is None else focus
+            self.play(*self.window_animations(focus), run_time=self.MEDIUM_ANIMATION)
+            return
+        
         animations = []
         for i, sorted_task_idx in enumerate(self.sorted_tasks):
             task = self.tasks[sorted_task_idx]
@@ -275,15 +391,15 @@ class PairwiseComparisonSort(Scene):
         
         if len(self.sorted_tasks) > 0:
             # Create a VGroup of the tasks in the current search range
-            search_range_tasks = VGroup(*[self.tasks[self.sorted_tasks[i]] for i in range(left, right)])
+            search_range_tasks = self.search_range_mobjects(left, right)
             
             # Create new braces for this search range
             new_blue_brace = Brace(search_range_tasks, direction=LEFT, color=DARK_BLUE)
             new_green_brace = Brace(search_range_tasks, direction=RIGHT, color=DARK_GREEN)
             
             # Add bounds labels with proper spacing to prevent overlap
-            bounds_text = Text(f"Searching: {left+1} to {right}", font_size=18, color=DARK_BLUE)
-            mid_text = Text(f"Comparing with: {mid+1}", font_size=18, color=DARK_GREEN)
+            bounds_text = cached_text(f"Searching: {left+1} to {right}", 18, DARK_BLUE)
+            mid_text = cached_text(f"Comparing with: {mid+1}", 18, DARK_GREEN)
             
             # Check if search_bounds_group is empty (first time for this task)
             if len(self.search_bounds_group) == 0:
@@ -335,7 +451,7 @@ class PairwiseComparisonSort(Scene):
                 middle_brace = Brace(self.search_bounds_group.middle_task, direction=RIGHT, color=DARK_GREEN)
                 
                 # Add "MID" label to the middle brace
-                mid_label = Text("MID", font_size=12, color=DARK_GREEN)
+                mid_label = cached_text("MID", 12, DARK_GREEN)
                 mid_label.next_to(middle_brace, RIGHT, buff=0.1)
                 
                 # Animate the shrinking
@@ -370,7 +486,7 @@ class PairwiseComparisonSort(Scene):
     
     def show_comparison(self, task_a_idx, task_b_idx, comparison_num, choice=None, is_final_comparison=False):
         # Create comparison UI with centered title
-        comparison_title = Text(f"Comparison #{comparison_num}", font_size=24, color=DARK_BLUE)
+        comparison_title = cached_text(f"Comparison #{comparison_num}", 24, DARK_BLUE)
         comparison_title.move_to(DOWN * 1.8)
         
         # Highlight the two tasks being compared
@@ -396,8 +512,8 @@ class PairwiseComparisonSort(Scene):
         # Add choice arrows pointing up from comparison boxes
         arrow_a = Arrow(task_a.get_top(), task_a.get_top() + UP * 0.2, color=GREEN)
         arrow_b = Arrow(task_b.get_top(), task_b.get_top() + UP * 0.2, color=GREEN)
-        choice_a = Text("A", font_size=24, color=GREEN)
-        choice_b = Text("B", font_size=24, color=GREEN)
+        choice_a = cached_text("A", 24, GREEN)
+        choice_b = cached_text("B", 24, GREEN)
         choice_a.next_to(arrow_a, UP, buff=0.05)
         choice_b.next_to(arrow_b, UP, buff=0.05)
         
@@ -498,6 +614,13 @@ class PairwiseComparisonSort(Scene):
         # Insert task into sorted list
         self.sorted_tasks.insert(position, task_idx)
         
+        if self.windowed:
+            for highlighted_task_idx in highlight_tasks:
+                self.tasks[highlighted_task_idx][0].set_stroke(DARK_BLUE, 3)
+            self.play(*self.window_animations(position), run_time=self.MEDIUM_ANIMATION)
+            self.play(*[self.tasks[i][0].animate.set_fill(WHITE, 1.0).set_stroke(BLACK, 1) for i in highlight_tasks])
+            return
+        
         # Animate all sorted tasks to their new positions simultaneously
         animations = []
         for i, sorted_task_idx in enumerate(self.sorted_tasks):
@@ -522,6 +645,11 @@ class PairwiseComparisonSort(Scene):
         # Insert task into sorted list
         self.sorted_tasks.insert(position, task_idx)
         
+        if self.windowed:
+            self.play(*self.window_animations(position), run_time=self.MEDIUM_ANIMATION)
+            self.play(self.tasks[task_idx][0].animate.set_fill(WHITE, 1.0))
+            return
+        
         # Animate all sorted tasks to their new positions simultaneously
         animations = []
         for i, sorted_task_idx in enumerate(self.sorted_tasks):
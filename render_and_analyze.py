@@ -4,122 +4,1189 @@ Automation script for manim rendering and frame analysis workflow.
 Renders animation at 1fps, extracts frames, and organizes output.
 """
 
+import argparse
+import ast
+import hashlib
+import json
+import math
 import os
 import shutil
 import subprocess
 import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-def run_command(cmd, description=""):
-    """Run a shell command and handle errors."""
+def run_command(cmd, log_file, description="", telemetry=None):
+    """Run a command, streaming its output to log_file.
+
+    Output goes to the log instead of being buffered in memory, so parallel
+    jobs don't interleave on the terminal. The peak RSS of the command and
+    its children is added to ``telemetry``. Returns False if the command
+    failed or couldn't be started.
+    """
     if description:
         print(f"{description}...")
-    
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-    
-    if result.returncode != 0:
-        print(f"Error: {result.stderr}")
+
+    with open(log_file, "a") as log:
+        try:
+            process = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT)
+        except OSError as error:
+            print(f"Error: could not run {cmd[0]}: {error}")
+            return False
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+    if telemetry is not None:
+        telemetry["peak_rss_kb"] = max(telemetry.get("peak_rss_kb", 0), usage.ru_maxrss)
+
+    if process.returncode != 0:
+        tail = Path(log_file).read_text(errors="replace").splitlines()[-20:]
+        print(f"Error: {' '.join(cmd[:3])} failed (full log: {log_file})")
+        print("\n".join(tail))
         return False
-    
+
     return True
 
-def create_timestamp_directory():
+def record_phase(telemetry, phase, started):
+    """Add the wall time since ``started`` to a phase of the session telemetry."""
+    if telemetry is not None:
+        phases = telemetry.setdefault("phases", {})
+        phases[phase] = round(phases.get(phase, 0) + time.perf_counter() - started, 3)
+
+def create_timestamp_directory(name=None):
     """Create a timestamped directory for this render session."""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     base_dir = Path("renders")
     base_dir.mkdir(exist_ok=True)
-    
-    session_dir = base_dir / f"session_{timestamp}"
-    session_dir.mkdir(exist_ok=True)
-    
-    return session_dir
-
-def render_animation(scene_file, scene_class, output_dir, fps=1):
-    """Render the animation at specified fps."""
-    print(f"Rendering {scene_class} at {fps}fps...")
-    
-    # Render at specified fps
-    cmd = f"poetry run manim -ql --fps {fps} {scene_file} {scene_class}"
-    
-    if not run_command(cmd, f"Rendering animation at {fps}fps"):
+
+    session_name = f"session_{timestamp}" if name is None else f"session_{timestamp}_{name}"
+    session_dir = base_dir / session_name
+
+    # Cached renders finish within the same second, so never reuse a directory
+    suffix = 1
+    while True:
+        try:
+            session_dir.mkdir()
+            return session_dir
+        except FileExistsError:
+            suffix += 1
+            session_dir = base_dir / f"{session_name}_{suffix}"
+
+RENDER_CACHE_DIR = Path("renders") / ".cache" / "sessions"
+TELEMETRY_FILE = "telemetry.json"
+
+# manim quality flag -> pixel height used in its output directory names
+QUALITY_DIRS = {"l": "480p", "m": "720p", "h": "1080p", "k": "2160p"}
+
+def expected_video_path(media_dir, scene_file, scene_class, fps, quality="l"):
+    """Return where manim writes the final video for a render."""
+    quality_dir = f"{QUALITY_DIRS[quality]}{fps}"
+    return Path(media_dir) / "videos" / Path(scene_file).stem / quality_dir / f"{scene_class}.mp4"
+
+def scene_source_files(scene_file):
+    """Return the scene file plus the local modules it imports, recursively."""
+    scene_file = Path(scene_file).resolve()
+    seen = []
+    pending = [scene_file]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.append(path)
+        tree = ast.parse(path.read_text(), filename=str(path))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                local = path.parent / f"{name.split('.')[0]}.py"
+                if local.exists():
+                    pending.append(local)
+    return sorted(seen)
+
+def scene_source_hash(scene_file):
+    """Hash of the scene module and its local imports."""
+    digest = hashlib.sha256()
+    for path in scene_source_files(scene_file):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+def render_cache_key(scene_file, scene_class, fps, quality="l", config_file=None, **options):
+    """Hash everything that determines a render's output.
+
+    Covers the scene module and its local imports, the scene class, fps,
+    quality, the folder-wide manim.cfg and any explicit config file.
+    """
+    digest = hashlib.sha256(scene_source_hash(scene_file).encode())
+    for cfg in (Path("manim.cfg"), config_file):
+        if cfg and Path(cfg).exists():
+            digest.update(Path(cfg).read_bytes())
+    settings = {"scene_class": scene_class, "fps": fps, "quality": quality, **options}
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    return digest.hexdigest()
+
+def reuse_cached_session(cache_key, output_dir, scene_class):
+    """Populate output_dir from the session recorded under cache_key.
+
+    Returns the source session on a hit, or None when there is no usable
+    cache entry.
+    """
+    from media_cache import link_or_copy
+
+    pointer = RENDER_CACHE_DIR / cache_key
+    if not pointer.exists():
+        return None
+
+    source_dir = Path(pointer.read_text().strip())
+    source_video = source_dir / f"{scene_class}.mp4"
+    source_frames = frame_files(source_dir / "frames")
+    if not source_frames:
+        pointer.unlink(missing_ok=True)
+        return None
+
+    # Snapshot sessions have frames but no video
+    if source_video.exists():
+        link_or_copy(source_video, output_dir / source_video.name)
+    frames_dir = output_dir / "frames"
+    frames_dir.mkdir(exist_ok=True)
+    for frame in source_frames:
+        link_or_copy(frame, frames_dir / frame.name)
+    # The dedup manifest and the animation timeline (see frame_tools.py) describe these frames
+    for name in ("manifest.json", "animations.json"):
+        if (source_dir / name).exists():
+            shutil.copy2(source_dir / name, output_dir / name)
+    write_frame_list(output_dir)
+
+    return source_dir
+
+def store_cached_session(cache_key, output_dir):
+    """Record output_dir as the render for cache_key."""
+    RENDER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = RENDER_CACHE_DIR / f"{cache_key}.tmp{os.getpid()}"
+    tmp.write_text(str(output_dir.resolve()))
+    os.replace(tmp, RENDER_CACHE_DIR / cache_key)
+
+def render_in_process(scene_file, scene_class, output_dir, fps, media_dir, quality, config_file,
+                      overrides=None, telemetry=None, after_play=None):
+    """Render through the manim Python API; return the video path or None."""
+    from scene_runner import render_scene
+
+    print(f"Rendering animation at {fps}fps (in-process)...")
+    try:
+        scene = render_scene(scene_file, scene_class, media_dir, fps, quality, config_file, overrides,
+                             after_play)
+    except Exception:
+        (output_dir / "render.log").write_text(traceback.format_exc())
+        print(f"Error: in-process render failed (full log: {output_dir / 'render.log'})")
+        print(traceback.format_exc(limit=-3))
+        return None
+
+    if telemetry is not None:
+        telemetry["animations"] = scene.renderer.num_plays
+    return Path(scene.renderer.file_writer.movie_file_path)
+
+def partial_movie_dir(media_dir, scene_file, scene_class, fps, quality):
+    """Where manim keeps the scene's partial movie files."""
+    video_dir = expected_video_path(media_dir, scene_file, scene_class, fps, quality).parent
+    return video_dir / "partial_movie_files" / scene_class
+
+def seed_media(media_dir, scene_file, scene_class, fps, quality, config_file, movies=True):
+    """Link the shared media cache into media_dir before a render (see media_cache.py)."""
+    import media_cache
+
+    if not media_cache.max_cache_bytes(config_file):
+        return 0
+    partial_dir = bucket = None
+    if movies:
+        partial_dir = partial_movie_dir(media_dir, scene_file, scene_class, fps, quality)
+        bucket = media_cache.movie_bucket(f"{QUALITY_DIRS[quality]}{fps}", config_file)
+    return media_cache.seed(media_dir, partial_dir, bucket)
+
+def publish_media(media_dir, scene_file, scene_class, fps, quality, config_file, movies=True):
+    """Add a finished render's text and partial-movie files to the shared media cache."""
+    import media_cache
+
+    max_bytes = media_cache.max_cache_bytes(config_file)
+    if not max_bytes:
+        return 0
+    partial_dir = bucket = None
+    if movies:
+        partial_dir = partial_movie_dir(media_dir, scene_file, scene_class, fps, quality)
+        bucket = media_cache.movie_bucket(f"{QUALITY_DIRS[quality]}{fps}", config_file)
+    added = media_cache.publish(media_dir, partial_dir, bucket)
+    media_cache.evict(max_bytes)
+    return added
+
+def count_partial_movies(media_dir, scene_file, scene_class, fps, quality):
+    """Count the animations manim combined into a video, or None if unknown."""
+    file_list = partial_movie_dir(media_dir, scene_file, scene_class, fps, quality) / "partial_movie_file_list.txt"
+    if not file_list.exists():
         return None
-    
-    # Find the generated video file
-    media_dir = Path("media/videos")
-    video_files = list(media_dir.glob(f"**/{scene_class}.mp4"))
-    
-    if not video_files:
-        print("Error: Could not find generated video file")
+    return sum(1 for line in file_list.read_text().splitlines() if line.startswith("file "))
+
+def render_snapshot_frames(scene_file, scene_class, output_dir, fps, media_dir, quality, config_file,
+                           telemetry=None, after_play=None):
+    """Write one frame per play()/wait() end state straight into frames/.
+
+    Skips both the video encode and the ffmpeg frame extraction. Returns
+    the frames directory, or None if the render failed.
+    """
+    from scene_runner import render_snapshots
+
+    frames_dir = output_dir / "frames"
+    frames_dir.mkdir(exist_ok=True)
+
+    print(f"Rendering {scene_class} snapshots (one frame per animation)...")
+    started = time.perf_counter()
+    seed_media(media_dir, scene_file, scene_class, fps, quality, config_file, movies=False)
+    try:
+        count = render_snapshots(scene_file, scene_class, frames_dir, media_dir, fps, quality, config_file,
+                                 after_play)
+    except Exception:
+        (output_dir / "render.log").write_text(traceback.format_exc())
+        print(f"Error: snapshot render failed (full log: {output_dir / 'render.log'})")
+        print(traceback.format_exc(limit=-3))
         return None
-    
-    video_file = video_files[0]
-    
+    publish_media(media_dir, scene_file, scene_class, fps, quality, config_file, movies=False)
+
+    record_phase(telemetry, "render", started)
+    if telemetry is not None:
+        telemetry["animations"] = count
+
+    print(f"Captured {count} snapshots")
+    return frames_dir
+
+def render_animation(scene_file, scene_class, output_dir, fps=1, media_dir="media",
+                     quality="l", config_file=None, in_process=False, animations=None, telemetry=None,
+                     after_play=None):
+    """Render the animation at specified fps.
+
+    animations is an optional inclusive (start, end) range of animation
+    numbers, as accepted by manim's -n option. after_play is a per-animation
+    hook for in-process renders (see scene_runner.hooked_scene_class).
+    """
+    print(f"Rendering {scene_class} at {fps}fps...")
+
+    # Remove any previous output so a failed render can't pick up a stale video
+    video_file = expected_video_path(media_dir, scene_file, scene_class, fps, quality)
+    video_file.unlink(missing_ok=True)
+
+    started = time.perf_counter()
+    reused = seed_media(media_dir, scene_file, scene_class, fps, quality, config_file)
+    if reused:
+        print(f"Media cache: linked {reused} cached text/partial-movie files")
+    if in_process:
+        overrides = None
+        if animations:
+            overrides = {"from_animation_number": animations[0], "upto_animation_number": animations[1]}
+        video_file = render_in_process(scene_file, scene_class, output_dir, fps, media_dir,
+                                       quality, config_file, overrides, telemetry, after_play)
+        if not video_file:
+            return None
+    else:
+        cmd = [
+            "poetry", "run", "manim", f"-q{quality}",
+            "--fps", str(fps),
+            "--media_dir", str(media_dir),
+        ]
+        if config_file:
+            cmd += ["--config_file", str(config_file)]
+        if animations:
+            cmd += ["-n", f"{animations[0]},{animations[1]}"]
+        cmd += [scene_file, scene_class]
+
+        if not run_command(cmd, output_dir / "render.log", f"Rendering animation at {fps}fps",
+                           telemetry=telemetry):
+            return None
+        if telemetry is not None:
+            telemetry["animations"] = count_partial_movies(media_dir, scene_file, scene_class, fps, quality)
+    record_phase(telemetry, "render", started)
+
+    if not video_file.exists():
+        print(f"Error: Could not find generated video file {video_file}")
+        return None
+    publish_media(media_dir, scene_file, scene_class, fps, quality, config_file)
+
     # Move video to output directory
+    started = time.perf_counter()
     output_video = output_dir / f"{scene_class}.mp4"
     shutil.move(str(video_file), str(output_video))
-    
+    record_phase(telemetry, "move", started)
+
     print(f"Video: {output_video.name}")
     return output_video
 
-def extract_frames(video_file, output_dir, fps=1):
-    """Extract frames from the video using ffmpeg."""
+def scan_animations(scene_file, scene_class, output_dir, fps=1, quality="l", config_file=None,
+                    in_process=False, telemetry=None):
+    """List the scene's animations without rendering any frames.
+
+    The records are kept as animations.json in the session. Returns them,
+    or None if the scene failed to run.
+    """
+    print(f"Counting animations in {scene_class}...")
+    scan_file = output_dir / "animations.json"
+    media_dir = output_dir / "scan_media"
+    seed_media(media_dir, scene_file, scene_class, fps, quality, config_file, movies=False)
+
+    if in_process:
+        from scene_runner import scan_scene
+
+        try:
+            records = scan_scene(scene_file, scene_class, media_dir, fps, quality, config_file)
+        except Exception:
+            (output_dir / "scan.log").write_text(traceback.format_exc())
+            print(f"Error: scanning {scene_class} failed (full log: {output_dir / 'scan.log'})")
+            return None
+        scan_file.write_text(json.dumps(records, indent=2))
+    else:
+        cmd = [
+            "poetry", "run", "python", str(Path(__file__).with_name("scene_runner.py")), "scan",
+            scene_file, scene_class,
+            "--output", str(scan_file),
+            "--media-dir", str(media_dir),
+            "--fps", str(fps),
+            "--quality", quality,
+        ]
+        if config_file:
+            cmd += ["--config", str(config_file)]
+        if not run_command(cmd, output_dir / "scan.log", telemetry=telemetry):
+            return None
+        records = json.loads(scan_file.read_text())
+
+    publish_media(media_dir, scene_file, scene_class, fps, quality, config_file, movies=False)
+    shutil.rmtree(media_dir, ignore_errors=True)
+    return records
+
+def section_range(records, section):
+    """Find a scene section by position (0 is the opening section) or by name.
+
+    Returns (name, (first, last)) with the inclusive range of animation
+    numbers in the section, or None if the scene has no such section.
+    """
+    names = list(dict.fromkeys(record["section"] for record in records))
+    if isinstance(section, int):
+        if not 0 <= section < len(names):
+            return None
+        name = names[section]
+    else:
+        matches = [name for name in names if name and name.lower() == section.lower()]
+        if not matches:
+            return None
+        name = matches[0]
+
+    indices = [record["index"] for record in records if record["section"] == name]
+    return name, (min(indices), max(indices))
+
+def render_section(scene_file, scene_class, output_dir, fps=1, media_dir="media", quality="l",
+                   config_file=None, in_process=False, section=0, telemetry=None):
+    """Render only the animations of one section of the scene.
+
+    Earlier animations run in manim's skip mode to reach the section's
+    starting state. Returns the video path, or None if the section wasn't
+    found or the render failed.
+    """
+    started = time.perf_counter()
+    records = scan_animations(scene_file, scene_class, output_dir, fps, quality, config_file, in_process,
+                              telemetry)
+    record_phase(telemetry, "scan", started)
+    if not records:
+        return None
+
+    found = section_range(records, section)
+    if not found:
+        print(f"Error: {scene_class} has no section {section!r}. Sections:")
+        for number, name in enumerate(dict.fromkeys(record["section"] for record in records)):
+            print(f"  {number}: {name}")
+        return None
+
+    name, animations = found
+    print(f"Section '{name}': animations {animations[0]}-{animations[1]} of {len(records)}")
+    if telemetry is not None:
+        telemetry["section"] = name
+    return render_animation(scene_file, scene_class, output_dir, fps, media_dir, quality, config_file,
+                            in_process, animations, telemetry)
+
+def split_animation_ranges(count, parts):
+    """Split animations 0..count-1 into at most `parts` inclusive (start, end) ranges."""
+    parts = max(1, min(parts, count))
+    bounds = [round(i * count / parts) for i in range(parts + 1)]
+    return [(bounds[i], bounds[i + 1] - 1) for i in range(parts)]
+
+def join_videos(videos, output_video, log_dir, telemetry=None):
+    """Concatenate videos with ffmpeg's concat demuxer, without re-encoding."""
+    list_file = log_dir / "segments.txt"
+    list_file.write_text("".join(f"file '{Path(video).resolve()}'\n" for video in videos))
+
+    cmd = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", str(list_file), "-c", "copy", str(output_video)]
+    if not run_command(cmd, log_dir / "concat.log", "Joining segments", telemetry=telemetry):
+        return None
+
+    list_file.unlink()
+    return output_video
+
+def render_segmented(scene_file, scene_class, output_dir, fps=1, quality="l", config_file=None,
+                     in_process=False, segments=2, telemetry=None):
+    """Render one scene as parallel animation ranges and join the pieces.
+
+    Each range renders in its own process with manim's -n option; the
+    partial videos are then joined without re-encoding. Returns the video
+    path, or None if any step failed.
+    """
+    started = time.perf_counter()
+    records = scan_animations(scene_file, scene_class, output_dir, fps, quality, config_file, in_process,
+                              telemetry)
+    record_phase(telemetry, "scan", started)
+    if not records:
+        return None
+    if telemetry is not None:
+        telemetry["animations"] = len(records)
+
+    ranges = split_animation_ranges(len(records), segments)
+    print(f"Rendering {len(records)} animations as {len(ranges)} segments...")
+
+    # Segments only report their child processes' memory; wall time is measured here
+    started = time.perf_counter()
+    segments_dir = output_dir / "segments"
+    segment_stats = [{} for _ in ranges]
+    executor = ProcessPoolExecutor if in_process else ThreadPoolExecutor
+    with executor(max_workers=len(ranges)) as pool:
+        futures = []
+        for number, animations in enumerate(ranges):
+            segment_dir = segments_dir / f"segment_{number:02d}"
+            segment_dir.mkdir(parents=True)
+            futures.append(pool.submit(
+                render_animation, scene_file, scene_class, segment_dir, fps, segment_dir / "media",
+                quality, config_file, in_process, animations, None if in_process else segment_stats[number],
+            ))
+        videos = [future.result() for future in futures]
+    record_phase(telemetry, "render", started)
+    if telemetry is not None:
+        peaks = [stats.get("peak_rss_kb", 0) for stats in segment_stats]
+        telemetry["peak_rss_kb"] = max([telemetry.get("peak_rss_kb", 0)] + peaks)
+
+    # Keep the segments around on failure so their logs can be inspected
+    if not all(videos):
+        return None
+
+    started = time.perf_counter()
+    video_file = join_videos(videos, output_dir / f"{scene_class}.mp4", output_dir, telemetry)
+    record_phase(telemetry, "join", started)
+    if video_file:
+        shutil.rmtree(segments_dir)
+        print(f"Video: {video_file.name}")
+    return video_file
+
+# ffmpeg output options per frame format; PNG adds -compression_level when one is given
+FRAME_FORMATS = {
+    "png": [],
+    "jpg": ["-q:v", "2"],
+    "webp": ["-c:v", "libwebp", "-quality", "90"],
+}
+FRAME_LIST_FILE = "frames.txt"
+# Below this many frames per process, ffmpeg startup outweighs the split
+MIN_FRAMES_PER_EXTRACT_JOB = 60
+
+def frame_files(frames_dir):
+    """Sorted frame images in frames_dir, whatever format they were saved in."""
+    frames_dir = Path(frames_dir)
+    if not frames_dir.exists():
+        return []
+    return sorted(path for path in frames_dir.glob("frame_*") if path.suffix[1:] in FRAME_FORMATS)
+
+def write_frame_list(output_dir):
+    """Write the session's frames, one relative path per line, to frames.txt."""
+    frames = frame_files(output_dir / "frames")
+    (output_dir / FRAME_LIST_FILE).write_text("".join(f"frames/{frame.name}\n" for frame in frames))
+    return frames
+
+def video_duration(video_file):
+    """Length of a video in seconds according to ffprobe, or None."""
+    cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", str(video_file)]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+def extract_frames(video_file, output_dir, fps=1, telemetry=None, frame_format="png",
+                   png_compression=None, jobs=None):
+    """Extract frames from the video using ffmpeg.
+
+    Long videos are split into time ranges that separate ffmpeg processes
+    extract side by side; each range numbers its frames from its own offset,
+    so the result matches a single pass. jobs caps the number of processes
+    (default: one per CPU, with at least MIN_FRAMES_PER_EXTRACT_JOB frames
+    each). The frame list is written once every range has finished.
+    """
     frames_dir = output_dir / "frames"
     frames_dir.mkdir(exist_ok=True)
-    
-    print(f"Extracting frames at {fps}fps...")
-    
-    # Use ffmpeg to extract frames
-    cmd = f"ffmpeg -i '{video_file}' -vf fps={fps} '{frames_dir}/frame_%04d.png'"
-    
-    if not run_command(cmd, "Extracting frames"):
+
+    duration = video_duration(video_file)
+    total = math.ceil(duration * fps) if duration else 0
+    jobs = jobs or max(1, min(os.cpu_count() or 1, total // MIN_FRAMES_PER_EXTRACT_JOB))
+    ranges = split_animation_ranges(total, jobs) if total else [(0, -1)]
+
+    codec = list(FRAME_FORMATS[frame_format])
+    if frame_format == "png" and png_compression is not None:
+        codec += ["-compression_level", str(png_compression)]
+    pattern = str(frames_dir / f"frame_%04d.{frame_format}")
+
+    print(f"Extracting frames at {fps}fps as {frame_format} with {len(ranges)} process(es)...")
+
+    commands = []
+    for number, (first, last) in enumerate(ranges):
+        cmd = ["ffmpeg", "-y", "-ss", f"{first / fps:.6f}", "-i", str(video_file)]
+        # The last range runs to the end so rounding never drops trailing frames
+        if number < len(ranges) - 1:
+            cmd += ["-t", f"{(last - first + 1) / fps:.6f}", "-frames:v", str(last - first + 1)]
+        cmd += ["-vf", f"fps={fps}", "-start_number", str(first + 1), *codec, pattern]
+        commands.append(cmd)
+
+    started = time.perf_counter()
+    if len(commands) == 1:
+        ok = run_command(commands[0], output_dir / "extract.log", "Extracting frames",
+                         telemetry=telemetry)
+    else:
+        range_stats = [{} for _ in commands]
+        with ThreadPoolExecutor(max_workers=len(commands)) as pool:
+            futures = [pool.submit(run_command, cmd, output_dir / f"extract_{number:02d}.log", "", stats)
+                       for number, (cmd, stats) in enumerate(zip(commands, range_stats))]
+            ok = all(future.result() for future in futures)
+        if telemetry is not None:
+            peaks = [stats.get("peak_rss_kb", 0) for stats in range_stats]
+            telemetry["peak_rss_kb"] = max([telemetry.get("peak_rss_kb", 0)] + peaks)
+    if not ok:
         return None
-    
-    # List extracted frames
-    frames = list(frames_dir.glob("frame_*.png"))
-    frames.sort()
-    
+    record_phase(telemetry, "extract", started)
+
+    frames = write_frame_list(output_dir)
     print(f"Extracted {len(frames)} frames")
     return frames_dir
 
+def dedup_session(output_dir, fps=None, threshold=None, in_process=False, telemetry=None):
+    """Collapse runs of near-identical frames, see frame_tools.dedup_frames.
+
+    fps is None for snapshot sessions, whose frames aren't evenly timed.
+    Returns the number of frames kept, or None if the step failed.
+    """
+    started = time.perf_counter()
+    extracted = len(frame_files(output_dir / "frames"))
+    if in_process:
+        from frame_tools import DEFAULT_THRESHOLD, dedup_frames
+
+        manifest = dedup_frames(output_dir, fps, DEFAULT_THRESHOLD if threshold is None else threshold)
+    else:
+        cmd = ["poetry", "run", "python", str(Path(__file__).with_name("frame_tools.py")), "dedup", str(output_dir)]
+        if fps:
+            cmd += ["--fps", str(fps)]
+        if threshold is not None:
+            cmd += ["--threshold", str(threshold)]
+        if not run_command(cmd, output_dir / "dedup.log", "Dropping duplicate frames", telemetry=telemetry):
+            return None
+        manifest = json.loads((output_dir / "manifest.json").read_text())
+        print(f"Dedup: kept {manifest['kept']} of {manifest['extracted']} frames")
+    record_phase(telemetry, "dedup", started)
+
+    write_frame_list(output_dir)
+    if telemetry is not None:
+        telemetry["frames_extracted"] = extracted
+    return manifest["kept"]
+
+def package_frames(output_dir, bundle=False, contact_sheets=False, in_process=False, telemetry=None):
+    """Write frames.npy and/or contact sheets for the session's frames (see frame_tools.py).
+
+    Returns False if a step failed.
+    """
+    started = time.perf_counter()
+    steps = (["bundle"] if bundle else []) + (["contact-sheets"] if contact_sheets else [])
+    if in_process:
+        from frame_tools import write_bundle, write_contact_sheets
+
+        if bundle and not write_bundle(output_dir):
+            return False
+        if contact_sheets and not write_contact_sheets(output_dir):
+            return False
+    else:
+        log_file = output_dir / "package.log"
+        for step in steps:
+            cmd = ["poetry", "run", "python", str(Path(__file__).with_name("frame_tools.py")), step, str(output_dir)]
+            if not run_command(cmd, log_file, telemetry=telemetry):
+                return False
+        if steps:
+            print(log_file.read_text(errors="replace"), end="")
+    record_phase(telemetry, "package", started)
+    return True
+
+def write_telemetry(output_dir, telemetry, started, in_process):
+    """Finish the session telemetry and save it as telemetry.json."""
+    import resource
+
+    telemetry["phases"]["total"] = round(time.perf_counter() - started, 3)
+    telemetry["frames"] = len(frame_files(output_dir / "frames"))
+
+    # Frames the render produced, before --dedup removed any
+    rendered = telemetry.get("frames_extracted", telemetry["frames"])
+    render_time = telemetry["phases"].get("render")
+    telemetry["fps_achieved"] = round(rendered / render_time, 2) if render_time else None
+
+    # In-process renders (and their pool workers) run in this process tree
+    peak_kb = telemetry.pop("peak_rss_kb", 0)
+    if in_process:
+        peak_kb = max(peak_kb,
+                      resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                      resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    telemetry["peak_rss_mb"] = round(peak_kb / 1024, 1) if peak_kb else None
+
+    (output_dir / TELEMETRY_FILE).write_text(json.dumps(telemetry, indent=2))
+
+    import sqlite3
+
+    from render_catalog import record_session
+
+    try:
+        shared = record_session(output_dir)
+    except sqlite3.Error as error:
+        print(f"Warning: could not record the session in the catalog: {error}")
+        return
+    if shared:
+        print(f"Catalog: {shared} frames identical to earlier sessions are now hardlinked")
+
+def apply_timing(timing):
+    """Render with the named timing profile from here on; None leaves it to the scene."""
+    from timing_profiles import TIMING_ENV
+
+    if timing:
+        os.environ[TIMING_ENV] = timing
+    else:
+        os.environ.pop(TIMING_ENV, None)
+
+def apply_dataset(dataset):
+    """Render with the given dataset (file path or JSON) from here on; None keeps the scene's own inputs."""
+    from scene_datasets import DATASET_ENV
+
+    if dataset:
+        os.environ[DATASET_ENV] = dataset
+    else:
+        os.environ.pop(DATASET_ENV, None)
+
+def render_session(scene_file, scene_class, fps=1, parallel=False, quality="l",
+                   config_file=None, use_cache=True, in_process=False, snapshots=False, segments=1,
+                   profile=False, monitor=False, timing=None, section=None, frame_format="png",
+                   png_compression=None, extract_jobs=None, dedup=False, dedup_threshold=None,
+                   bundle=False, contact_sheets=False, dataset=None):
+    """Render one scene into its own session directory and extract its frames.
+
+    Every render gets a throwaway media directory in its session, seeded
+    from the shared media cache (see media_cache.py), so parallel jobs
+    never race on manim's output paths. When nothing that affects the
+    output has changed since an earlier session, its video and frames are
+    hardlinked instead of re-rendered. Per-phase timings are saved as
+    telemetry.json. With profile the in-process render is sampled, and with
+    monitor the scene graph is measured after every animation; both report
+    into analysis/. section (a position or name, see section_range) limits
+    the render to one section of the scene. frame_format, png_compression
+    and extract_jobs are passed to extract_frames; with dedup, runs of
+    near-identical frames are collapsed afterwards, and bundle and
+    contact_sheets add frames.npy and contact sheets (see frame_tools.py).
+    dataset replaces the scene's inputs (see scene_datasets.py). Returns
+    the session directory, or None if any step failed.
+    """
+    started = time.perf_counter()
+    output_dir = create_timestamp_directory(scene_class if parallel else None)
+    print(f"Session: {output_dir}")
+
+    # Create analysis directory for review notes
+    analysis_dir = output_dir / "analysis"
+    analysis_dir.mkdir(exist_ok=True)
+
+    telemetry = {
+        "scene_file": str(scene_file),
+        "scene_class": scene_class,
+        "source_hash": scene_source_hash(scene_file),
+        "fps": fps,
+        "quality": quality,
+        "config_file": str(config_file) if config_file else None,
+        "mode": "snapshots" if snapshots else ("in-process" if in_process else "subprocess"),
+        "segments": segments,
+        "timing": timing,
+        "dataset": dataset,
+        "section": None,
+        "frame_format": "png" if snapshots else frame_format,
+        "status": "failed",
+        "cache_hit": False,
+        "phases": {},
+        "animations": None,
+    }
+
+    from scene_datasets import load_dataset
+
+    apply_timing(timing)
+    apply_dataset(dataset)
+    cache_key = render_cache_key(scene_file, scene_class, fps, quality, config_file,
+                                 snapshots=snapshots, timing=timing, section=section,
+                                 frame_format=frame_format, png_compression=png_compression,
+                                 dedup=dedup, dedup_threshold=dedup_threshold,
+                                 dataset=load_dataset(dataset) if dataset else None)
+    if use_cache and not (profile or monitor):
+        source_dir = reuse_cached_session(cache_key, output_dir, scene_class)
+        if source_dir:
+            print(f"Cache hit: reusing render from {source_dir}")
+            telemetry.update(cache_hit=True, cached_from=str(source_dir))
+            source_telemetry = source_dir / TELEMETRY_FILE
+            if source_telemetry.exists():
+                # Which part of the scene the cached video holds
+                telemetry["section"] = json.loads(source_telemetry.read_text()).get("section")
+            if (bundle or contact_sheets) and not package_frames(output_dir, bundle, contact_sheets, in_process,
+                                                                 telemetry):
+                print(f"Failed to package the frames of {scene_class}")
+                write_telemetry(output_dir, telemetry, started, in_process)
+                return None
+            telemetry["status"] = "ok"
+            write_telemetry(output_dir, telemetry, started, in_process)
+            return output_dir
+
+    media_dir = output_dir / "media"
+
+    sampler = None
+    if profile:
+        from render_profiler import StackSampler
+
+        sampler = StackSampler(scene_file)
+        sampler.start()
+
+    graph_records = []
+    after_play = None
+    if monitor:
+        from scene_graph_monitor import scene_graph_recorder
+
+        after_play = scene_graph_recorder(graph_records)
+
+    try:
+        if snapshots:
+            frames_dir = render_snapshot_frames(scene_file, scene_class, output_dir, fps, media_dir,
+                                               quality, config_file, telemetry, after_play)
+        elif section is not None:
+            video_file = render_section(scene_file, scene_class, output_dir, fps, media_dir, quality,
+                                        config_file, in_process, section, telemetry)
+        elif segments > 1:
+            video_file = render_segmented(scene_file, scene_class, output_dir, fps, quality,
+                                          config_file, in_process, segments, telemetry)
+        else:
+            video_file = render_animation(scene_file, scene_class, output_dir, fps, media_dir,
+                                          quality, config_file, in_process, telemetry=telemetry,
+                                          after_play=after_play)
+    finally:
+        if sampler:
+            sampler.stop()
+            sampler.write_collapsed(analysis_dir / "profile.collapsed")
+            sampler.write_top(analysis_dir / "profile_top.txt")
+            print(f"Profile: {analysis_dir / 'profile_top.txt'}")
+        if monitor:
+            from scene_graph_monitor import write_report
+
+            write_report(graph_records, analysis_dir / "scene_graph.json")
+        shutil.rmtree(media_dir, ignore_errors=True)
+
+    if snapshots:
+        if not frames_dir:
+            print(f"Failed to render snapshots for {scene_class}")
+            write_telemetry(output_dir, telemetry, started, in_process)
+            return None
+        write_frame_list(output_dir)
+    else:
+        if not video_file:
+            print(f"Failed to render {scene_class}")
+            write_telemetry(output_dir, telemetry, started, in_process)
+            return None
+
+        frames_dir = extract_frames(video_file, output_dir, fps, telemetry, frame_format,
+                                    png_compression, extract_jobs)
+        if not frames_dir:
+            print(f"Failed to extract frames for {scene_class}")
+            write_telemetry(output_dir, telemetry, started, in_process)
+            return None
+
+    if dedup and dedup_session(output_dir, None if snapshots else fps, dedup_threshold, in_process,
+                               telemetry) is None:
+        print(f"Failed to drop duplicate frames for {scene_class}")
+        write_telemetry(output_dir, telemetry, started, in_process)
+        return None
+
+    if (bundle or contact_sheets) and not package_frames(output_dir, bundle, contact_sheets, in_process, telemetry):
+        print(f"Failed to package the frames of {scene_class}")
+        write_telemetry(output_dir, telemetry, started, in_process)
+        return None
+
+    telemetry["status"] = "ok"
+    write_telemetry(output_dir, telemetry, started, in_process)
+    store_cached_session(cache_key, output_dir)
+    return output_dir
+
+def estimate_render(scene_file, scene_class, fps=1, quality="l", config_file=None, in_process=False,
+                    timing=None, dataset=None):
+    """Predict a render's animations, frames and wall time without drawing anything.
+
+    The scene runs once with a null renderer; nothing is saved. Returns
+    the timeline summary, or None if the scene failed to run.
+    """
+    from timeline_estimate import (class_attributes, print_estimate, seconds_per_frame, summarize_timeline,
+                                   timing_constants)
+    from timing_profiles import PROFILES, selected_profile
+
+    apply_timing(timing)
+    apply_dataset(dataset)
+    with tempfile.TemporaryDirectory() as scan_dir:
+        records = scan_animations(scene_file, scene_class, Path(scan_dir), fps, quality, config_file, in_process)
+        if records is None:
+            print((Path(scan_dir) / "scan.log").read_text())
+            return None
+
+    constants = timing_constants(scene_file, scene_class)
+    # The profile the scan ran with, chosen the way TimingProfileMixin does
+    default = class_attributes(scene_file, scene_class).get("TIMING_PROFILE", "final")
+    constants.update(PROFILES[selected_profile(default)]["constants"])
+    summary = summarize_timeline(records, constants, fps)
+    print_estimate(scene_class, summary, fps, quality, seconds_per_frame(scene_class, quality))
+    return summary
+
+def lint_layout(scene_file, scene_class, fps=1, quality="l", config_file=None, in_process=False, timing=None,
+                dataset=None):
+    """Check every play() end state for overlaps, off-frame objects and tiny text.
+
+    Runs on the null renderer, so nothing is drawn or encoded. The report
+    is saved as analysis/layout_lint.json in a new session. Returns the
+    session directory, or None if the scene failed to run.
+    """
+    apply_timing(timing)
+    apply_dataset(dataset)
+    output_dir = create_timestamp_directory()
+    analysis_dir = output_dir / "analysis"
+    analysis_dir.mkdir()
+    report_file = analysis_dir / "layout_lint.json"
+    media_dir = output_dir / "lint_media"
+    print(f"Session: {output_dir}")
+    print(f"Linting layout of {scene_class}...")
+
+    try:
+        if in_process:
+            from layout_linter import write_report
+            from scene_runner import lint_scene
+
+            try:
+                issues = lint_scene(scene_file, scene_class, media_dir, fps, quality, config_file)
+            except Exception:
+                (output_dir / "lint.log").write_text(traceback.format_exc())
+                print(f"Error: linting {scene_class} failed (full log: {output_dir / 'lint.log'})")
+                return None
+            write_report(issues, report_file)
+        else:
+            cmd = [
+                "poetry", "run", "python", str(Path(__file__).with_name("scene_runner.py")), "lint",
+                scene_file, scene_class,
+                "--output", str(report_file),
+                "--media-dir", str(media_dir),
+                "--fps", str(fps),
+                "--quality", quality,
+            ]
+            if config_file:
+                cmd += ["--config", str(config_file)]
+            log_file = output_dir / "lint.log"
+            if not run_command(cmd, log_file):
+                return None
+            print(log_file.read_text(errors="replace"), end="")
+    finally:
+        shutil.rmtree(media_dir, ignore_errors=True)
+
+    print(f"Report: {report_file}")
+    return output_dir
+
+def find_previous_session(output_dir, scene_class):
+    """Return the newest other session of scene_class that has telemetry, or None.
+
+    Looks the session up in the catalog (see render_catalog.py), falling
+    back to the session directories for renders made before it existed.
+    """
+    from render_catalog import connect, latest_session
+
+    previous = latest_session(connect(), scene_class, exclude=output_dir)
+    if previous and (previous / TELEMETRY_FILE).exists():
+        return previous
+
+    for telemetry_file in sorted(Path("renders").glob(f"session_*/{TELEMETRY_FILE}"), reverse=True):
+        session = telemetry_file.parent
+        if session.resolve() == Path(output_dir).resolve():
+            continue
+        if json.loads(telemetry_file.read_text()).get("scene_class") == scene_class:
+            return session
+    return None
+
+def compare_telemetry(output_dir, previous_dir):
+    """Print how this session's telemetry differs from a previous session's."""
+    current = json.loads((Path(output_dir) / TELEMETRY_FILE).read_text())
+    previous_file = Path(previous_dir) / TELEMETRY_FILE
+    if not previous_file.exists():
+        print(f"Error: {previous_file} not found")
+        return
+
+    previous = json.loads(previous_file.read_text())
+    rows = [(f"{phase} (s)", previous["phases"].get(phase), current["phases"].get(phase))
+            for phase in dict.fromkeys([*previous["phases"], *current["phases"]])]
+    rows += [(field, previous.get(field), current.get(field))
+             for field in ("animations", "frames", "fps_achieved", "peak_rss_mb")]
+
+    print(f"\nTelemetry vs {previous_dir}:")
+    for name, before, after in rows:
+        if isinstance(before, (int, float)) and isinstance(after, (int, float)) and before:
+            change = f"{(after - before) / before:+.1%}"
+        else:
+            change = ""
+        print(f"  {name:<16} {str(before):>10} -> {str(after):<10} {change}")
+
+def render_with_worker(scene_file, scene_class, fps=1, **options):
+    """Hand a render job to a running render_worker.py.
+
+    Takes render_session's arguments. Returns the session directory, None
+    if the render failed, or raises OSError when no worker is listening.
+    """
+    from render_worker import submit_job
+
+    config_file = options.get("config_file")
+    job = {
+        **options,
+        "scene_file": str(Path(scene_file).resolve()),
+        "scene_class": scene_class,
+        "fps": fps,
+        "config_file": str(Path(config_file).resolve()) if config_file else None,
+    }
+    reply = submit_job(job)
+    print(reply["log"], end="")
+    return Path(reply["session"]) if reply["session"] else None
+
+def parse_scene_jobs(args):
+    """Expand the command line into a list of (scene_file, scene_class) jobs."""
+    jobs = [(args.scene_file, name.strip()) for name in args.scene_class.split(",") if name.strip()]
+    for spec in args.scene:
+        scene_file, _, scene_class = spec.rpartition(":")
+        if not scene_file or not scene_class:
+            print(f"Error: --scene expects FILE:CLASS, got '{spec}'")
+            sys.exit(1)
+        jobs.append((scene_file, scene_class))
+    return jobs
+
+def compare_sessions(jobs, sessions, compare):
+    """Diff each finished session's telemetry against the session named by --compare."""
+    for (_, scene_class), output_dir in zip(jobs, sessions):
+        if not output_dir:
+            continue
+        previous_dir = find_previous_session(output_dir, scene_class) if compare == "previous" else compare
+        if previous_dir:
+            compare_telemetry(output_dir, previous_dir)
+        else:
+            print(f"\nNo earlier {scene_class} session with telemetry to compare against")
+
+def report_sessions(jobs, sessions, compare=None):
+    """Print a summary line per job and exit non-zero if any failed."""
+    print()
+    for (_, scene_class), output_dir in zip(jobs, sessions):
+        if output_dir:
+            frames = frame_files(output_dir / "frames")
+            print(f"✓ {scene_class}: {len(frames)} frames in {output_dir}")
+        else:
+            print(f"✗ {scene_class}: failed")
+
+    if compare:
+        compare_sessions(jobs, sessions, compare)
+
+    if not all(sessions):
+        sys.exit(1)
+
 def main():
     """Main automation workflow."""
-    if len(sys.argv) < 3:
-        print("Usage: python render_and_analyze.py <scene_file> <scene_class> [fps]")
-        print("Example: python render_and_analyze.py pairwise_comparison_animation.py PairwiseComparisonSort 30")
-        sys.exit(1)
-    
-    scene_file = sys.argv[1]
-    scene_class = sys.argv[2]
-    fps = int(sys.argv[3]) if len(sys.argv) > 3 else 1
-    
-    # Verify scene file exists
-    if not Path(scene_file).exists():
-        print(f"Error: Scene file '{scene_file}' not found")
+    from timing_profiles import PROFILES, TIMING_ENV, config_timing
+
+    parser = argparse.ArgumentParser(
+        description="Render manim scenes and extract frames for review.",
+        epilog="Example: python render_and_analyze.py pairwise_comparison_animation.py PairwiseComparisonSort 30",
+    )
+    parser.add_argument("scene_file", nargs="?")
+    parser.add_argument("scene_class", nargs="?", help="scene class, or a comma-separated list of classes in scene_file")
+    parser.add_argument("fps", nargs="?", type=int, default=1)
+    parser.add_argument("--scene", action="append", default=[], metavar="FILE:CLASS",
+                        help="also render CLASS from FILE (repeatable)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="parallel render workers when rendering several scenes (default: CPU count)")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITY_DIRS), default="l",
+                        help="manim render quality (default: l)")
+    parser.add_argument("--config", metavar="FILE", help="manim config file, e.g. preview.cfg")
+    parser.add_argument("--force", action="store_true",
+                        help="re-render even if an identical render is cached")
+    parser.add_argument("--in-process", action="store_true",
+                        help="render through the manim Python API instead of a poetry/manim subprocess")
+    parser.add_argument("--snapshots", action="store_true",
+                        help="save one frame per play()/wait() end state instead of encoding a video")
+    parser.add_argument("--segments", type=int, default=1, metavar="N",
+                        help="split each scene into N animation ranges rendered in parallel, then join them")
+    step = parser.add_mutually_exclusive_group()
+    step.add_argument("--section", type=int, metavar="K",
+                      help="render only section K of the scene (0 is the opening; K is the K-th insertion)")
+    step.add_argument("--task", metavar="NAME", help="render only the section that inserts task NAME")
+    parser.add_argument("--frame-format", choices=list(FRAME_FORMATS), default="png",
+                        help="image format of extracted frames (default: png)")
+    parser.add_argument("--png-compression", type=int, choices=range(10), metavar="0-9",
+                        help="PNG zlib level; 1 writes much faster than ffmpeg's default")
+    parser.add_argument("--extract-jobs", type=int, metavar="N",
+                        help="ffmpeg processes for frame extraction (default: by frame count, up to CPU count)")
+    parser.add_argument("--dedup", action="store_true",
+                        help="drop near-identical consecutive frames and map the kept ones to times in manifest.json")
+    parser.add_argument("--dedup-threshold", type=float, metavar="T",
+                        help="largest thumbnail pixel change (0-255) --dedup treats as a duplicate (default: 8)")
+    parser.add_argument("--bundle", action="store_true",
+                        help="also pack the frames into one memory-mappable frames.npy")
+    parser.add_argument("--contact-sheets", action="store_true",
+                        help="also tile the frames into labelled 6x6 contact sheets")
+    parser.add_argument("--dataset", metavar="FILE",
+                        help="JSON file of scene inputs to render with, e.g. TASK_NAMES (see scene_datasets.py)")
+    parser.add_argument("--matrix", metavar="FILE",
+                        help="render every job of a matrix file through a resumable queue (see render_matrix.py)")
+    parser.add_argument("--profile", action="store_true",
+                        help="render in-process under a sampling profiler; writes analysis/profile.*")
+    parser.add_argument("--monitor", action="store_true",
+                        help="record scene-graph size after every animation and flag unbounded growth")
+    parser.add_argument("--timing", choices=sorted(PROFILES),
+                        help="timing profile: final, preview, or analysis (one frame per animation, no waits); "
+                             f"defaults to ${TIMING_ENV} or the config file's [timing] profile")
+    parser.add_argument("--lint", action="store_true",
+                        help="check every play() end state for overlaps, off-frame objects and tiny text, "
+                             "without rendering; writes analysis/layout_lint.json")
+    parser.add_argument("--estimate", action="store_true",
+                        help="dry-run the scene and predict animation count, frames and render time")
+    parser.add_argument("--compare", nargs="?", const="previous", metavar="SESSION",
+                        help="diff telemetry against SESSION (default: the previous session of the scene)")
+    parser.add_argument("--worker", action="store_true",
+                        help="send jobs to a running render_worker.py instead of rendering here")
+    args = parser.parse_intermixed_args()
+
+    if args.matrix:
+        from render_matrix import run_matrix
+
+        if not Path(args.matrix).exists():
+            print(f"Error: Matrix file '{args.matrix}' not found")
+            sys.exit(1)
+        try:
+            ok = run_matrix(args.matrix, args.jobs, use_cache=not args.force)
+        except (ValueError, KeyError) as error:
+            print(f"Error: invalid matrix file {args.matrix}: {error}")
+            sys.exit(1)
+        sys.exit(0 if ok else 1)
+    if not args.scene_file or not args.scene_class:
+        parser.error("scene_file and scene_class are required unless --matrix is given")
+
+    jobs = parse_scene_jobs(args)
+
+    # Verify scene files exist
+    for scene_file, _ in jobs:
+        if not Path(scene_file).exists():
+            print(f"Error: Scene file '{scene_file}' not found")
+            sys.exit(1)
+    if args.config and not Path(args.config).exists():
+        print(f"Error: Config file '{args.config}' not found")
         sys.exit(1)
-    
-    # Create output directory
-    output_dir = create_timestamp_directory()
-    print(f"Session: {output_dir}")
-    
-    # Render animation
-    video_file = render_animation(scene_file, scene_class, output_dir, fps)
-    if not video_file:
-        print("Failed to render animation")
+
+    timing = args.timing or (config_timing(args.config) if args.config else None) or os.environ.get(TIMING_ENV)
+    if timing and timing not in PROFILES:
+        print(f"Error: unknown timing profile '{timing}' (expected one of: {', '.join(PROFILES)})")
         sys.exit(1)
-    
-    # Extract frames
-    frames_dir = extract_frames(video_file, output_dir, fps)
-    if not frames_dir:
-        print("Failed to extract frames")
+
+    dataset = None
+    if args.dataset:
+        from scene_datasets import load_dataset
+
+        try:
+            load_dataset(args.dataset)
+        except (OSError, ValueError) as error:
+            print(f"Error: can't read dataset '{args.dataset}': {error}")
+            sys.exit(1)
+        dataset = str(Path(args.dataset).resolve())
+
+    section = args.section if args.section is not None else args.task
+    if section is not None and args.snapshots:
+        print("Error: --section/--task render a video; they can't be combined with --snapshots")
         sys.exit(1)
-    
-    # Create analysis directory for review notes
-    analysis_dir = output_dir / "analysis"
-    analysis_dir.mkdir(exist_ok=True)
-    
-    frames = list(frames_dir.glob("frame_*.png"))
-    print(f"\n✓ Complete: {len(frames)} frames in {output_dir}")
+
+    options = {
+        "quality": args.quality,
+        "config_file": args.config,
+        "use_cache": not args.force,
+        "in_process": args.in_process or args.snapshots or args.profile or args.monitor,
+        "snapshots": args.snapshots,
+        "segments": 1 if args.profile or args.monitor or section is not None else args.segments,
+        "profile": args.profile,
+        "monitor": args.monitor,
+        "timing": timing,
+        "section": section,
+        "frame_format": args.frame_format,
+        "png_compression": args.png_compression,
+        "extract_jobs": args.extract_jobs,
+        "dedup": args.dedup,
+        "dedup_threshold": args.dedup_threshold,
+        "bundle": args.bundle,
+        "contact_sheets": args.contact_sheets,
+        "dataset": dataset,
+    }
+
+    if args.estimate:
+        summaries = [estimate_render(*job, args.fps, args.quality, args.config, options["in_process"], timing,
+                                     dataset)
+                     for job in jobs]
+        if not all(summaries):
+            sys.exit(1)
+        return
+
+    if args.lint:
+        sessions = [lint_layout(*job, args.fps, args.quality, args.config, options["in_process"], timing, dataset)
+                    for job in jobs]
+        if not all(sessions):
+            sys.exit(1)
+        return
+
+    if args.worker:
+        try:
+            sessions = [render_with_worker(*job, args.fps, **options) for job in jobs]
+        except OSError:
+            print("No render worker running (start one with: poetry run python render_worker.py)")
+            print("Rendering locally instead...")
+        else:
+            report_sessions(jobs, sessions, args.compare)
+            return
+
+    if len(jobs) == 1:
+        scene_file, scene_class = jobs[0]
+        output_dir = render_session(scene_file, scene_class, args.fps, **options)
+        if not output_dir:
+            sys.exit(1)
+        frames = frame_files(output_dir / "frames")
+        print(f"\n✓ Complete: {len(frames)} frames in {output_dir}")
+        if args.compare:
+            compare_sessions(jobs, [output_dir], args.compare)
+        return
+
+    workers = max(1, min(args.jobs, len(jobs)))
+    print(f"Rendering {len(jobs)} scenes with {workers} workers...")
+    # In-process renders share manim's global config, so they need separate processes
+    executor = ProcessPoolExecutor if options["in_process"] else ThreadPoolExecutor
+    with executor(max_workers=workers) as pool:
+        futures = [pool.submit(render_session, *job, args.fps, parallel=True, **options) for job in jobs]
+        sessions = [future.result() for future in futures]
+
+    report_sessions(jobs, sessions, args.compare)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
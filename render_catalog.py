@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+SQLite catalog of render sessions.
+
+render_and_analyze.py records every session here when it writes the
+session's telemetry.json: scene, source hash, config, fps, timings, and
+each frame with a content hash. Frames identical to one already in the
+catalog are replaced by a hardlink to it, so repeated renders of the same
+layout don't take up disk space again.
+
+Usage:
+    python render_catalog.py latest PairwiseComparisonSort        # newest good session
+    python render_catalog.py slower [--scene CLASS] [--factor 1.2]
+    python render_catalog.py changed SESSION_A SESSION_B          # or: changed --scene CLASS
+    python render_catalog.py prune --keep 5 --days 14 [--dry-run]
+    python render_catalog.py index                                # add sessions recorded before the catalog
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import statistics
+import time
+from datetime import datetime
+from pathlib import Path
+
+CATALOG_FILE = Path("renders") / "catalog.sqlite3"
+FRAME_SUFFIXES = (".png", ".jpg", ".webp")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    created REAL NOT NULL,
+    scene_file TEXT,
+    scene_class TEXT,
+    source_hash TEXT,
+    config_file TEXT,
+    config_hash TEXT,
+    fps INTEGER,
+    quality TEXT,
+    timing TEXT,
+    mode TEXT,
+    status TEXT,
+    cache_hit INTEGER,
+    render_seconds REAL,
+    total_seconds REAL,
+    frame_count INTEGER,
+    telemetry TEXT
+);
+CREATE TABLE IF NOT EXISTS frames (
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (session_id, position)
+);
+CREATE INDEX IF NOT EXISTS frames_hash ON frames(hash);
+CREATE INDEX IF NOT EXISTS sessions_scene ON sessions(scene_class, created);
+"""
+
+def connect(catalog_file=CATALOG_FILE):
+    """Open the catalog, creating it if needed.
+
+    Parallel render jobs record sessions at the same time, so writers wait
+    for each other instead of failing on a locked database.
+    """
+    Path(catalog_file).parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(catalog_file, timeout=60)
+    db.row_factory = sqlite3.Row
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA foreign_keys=ON")
+    db.executescript(SCHEMA)
+    return db
+
+def session_key(session_dir):
+    """How a session is stored: its path relative to the project root when inside it."""
+    path = Path(session_dir).resolve()
+    try:
+        return str(path.relative_to(Path.cwd().resolve()))
+    except ValueError:
+        return str(path)
+
+def session_created(session_dir):
+    """Start time of a session, from its session_YYYYMMDD_HHMMSS name."""
+    try:
+        return datetime.strptime(Path(session_dir).name[8:23], "%Y%m%d_%H%M%S").timestamp()
+    except ValueError:
+        return Path(session_dir).stat().st_mtime
+
+def file_hash(path):
+    """sha256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def config_hash(config_file):
+    """Hash of manim.cfg plus the session's config file, as render_cache_key reads them."""
+    digest = hashlib.sha256()
+    for cfg in ("manim.cfg", config_file):
+        if cfg and Path(cfg).exists():
+            digest.update(Path(cfg).read_bytes())
+    return digest.hexdigest()
+
+def share_frame(db, frame, digest, session_id):
+    """Replace frame with a hardlink to an identical frame of another session.
+
+    Returns True when a link was made; frames that already share their
+    data (cached sessions) are left alone.
+    """
+    rows = db.execute(
+        "SELECT sessions.path, frames.name FROM frames JOIN sessions ON sessions.id = frames.session_id "
+        "WHERE frames.hash = ? AND frames.session_id != ? LIMIT 5", (digest, session_id))
+    for row in rows:
+        original = Path(row["path"]) / "frames" / row["name"]
+        try:
+            if original.samefile(frame):
+                return False
+            tmp = frame.with_name(f".{frame.name}.tmp{os.getpid()}")
+            os.link(original, tmp)
+        except OSError:  # deleted meanwhile, or on another filesystem
+            continue
+        os.replace(tmp, frame)
+        return True
+    return False
+
+def record_session(session_dir, db=None):
+    """Add or update a session from its telemetry.json and frames.
+
+    Returns the number of frames that were hardlinked to identical frames
+    of other sessions.
+    """
+    session_dir = Path(session_dir)
+    telemetry = json.loads((session_dir / "telemetry.json").read_text())
+    frames = sorted(path for path in (session_dir / "frames").glob("frame_*") if path.suffix in FRAME_SUFFIXES)
+    phases = telemetry.get("phases", {})
+
+    db = db or connect()
+    with db:
+        db.execute("DELETE FROM sessions WHERE path = ?", (session_key(session_dir),))
+        session_id = db.execute(
+            "INSERT INTO sessions (path, created, scene_file, scene_class, source_hash, config_file, config_hash,"
+            " fps, quality, timing, mode, status, cache_hit, render_seconds, total_seconds, frame_count, telemetry)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (session_key(session_dir), session_created(session_dir), telemetry.get("scene_file"),
+             telemetry.get("scene_class"), telemetry.get("source_hash"), telemetry.get("config_file"),
+             config_hash(telemetry.get("config_file")), telemetry.get("fps"), telemetry.get("quality"),
+             telemetry.get("timing"), telemetry.get("mode"), telemetry.get("status"),
+             int(bool(telemetry.get("cache_hit"))), phases.get("render"), phases.get("total"),
+             len(frames), json.dumps(telemetry)),
+        ).lastrowid
+
+        shared = 0
+        for position, frame in enumerate(frames):
+            digest = file_hash(frame)
+            shared += share_frame(db, frame, digest, session_id)
+            db.execute("INSERT INTO frames (session_id, position, name, hash) VALUES (?, ?, ?, ?)",
+                       (session_id, position, frame.name, digest))
+    return shared
+
+def latest_session(db, scene_class, quality=None, fps=None, exclude=None):
+    """Path of the newest good session of scene_class, or None."""
+    query = "SELECT path FROM sessions WHERE scene_class = ? AND status = 'ok'"
+    params = [scene_class]
+    if quality:
+        query += " AND quality = ?"
+        params.append(quality)
+    if fps:
+        query += " AND fps = ?"
+        params.append(fps)
+    if exclude:
+        query += " AND path != ?"
+        params.append(session_key(exclude))
+    for row in db.execute(query + " ORDER BY created DESC, id DESC", params):
+        if Path(row["path"]).exists():
+            return Path(row["path"])
+    return None
+
+def slower_sessions(db, scene_class=None, factor=1.2):
+    """Rendered sessions whose render time exceeds factor x the median of their group.
+
+    Sessions are grouped by scene, quality, fps and timing profile; cache
+    hits and failed renders don't count. Returns (row, baseline) pairs.
+    """
+    query = ("SELECT * FROM sessions WHERE status = 'ok' AND NOT cache_hit AND render_seconds IS NOT NULL"
+             + (" AND scene_class = ?" if scene_class else "") + " ORDER BY created")
+    groups = {}
+    for row in db.execute(query, [scene_class] if scene_class else []):
+        groups.setdefault((row["scene_class"], row["quality"], row["fps"], row["timing"]), []).append(row)
+
+    slower = []
+    for rows in groups.values():
+        baseline = statistics.median(row["render_seconds"] for row in rows)
+        slower += [(row, baseline) for row in rows if row["render_seconds"] > factor * baseline]
+    return slower
+
+def changed_frames(db, first, second):
+    """Frames at the same position whose contents differ between two sessions.
+
+    Returns (position, name in first, name in second) tuples; a frame
+    missing from either session counts as changed.
+    """
+    def frame_hashes(path):
+        row = db.execute("SELECT id FROM sessions WHERE path = ?", (session_key(path),)).fetchone()
+        if row is None:
+            raise ValueError(f"{path} is not in the catalog (run: python render_catalog.py index)")
+        return {frame["position"]: (frame["name"], frame["hash"])
+                for frame in db.execute("SELECT * FROM frames WHERE session_id = ?", (row["id"],))}
+
+    before, after = frame_hashes(first), frame_hashes(second)
+    changed = []
+    for position in sorted(set(before) | set(after)):
+        old, new = before.get(position, (None, None)), after.get(position, (None, None))
+        if old[1] != new[1]:
+            changed.append((position, old[0], new[0]))
+    return changed
+
+def prune(db, keep=5, days=14, dry_run=False):
+    """Delete old sessions: all but the newest keep good ones per scene, once older than days.
+
+    Failed sessions are kept for the same number of days. Returns the
+    paths removed (or that would be, with dry_run).
+    """
+    cutoff = time.time() - days * 86400
+    removed = []
+    rows = db.execute("SELECT * FROM sessions ORDER BY created DESC, id DESC").fetchall()
+    kept = {}
+    for row in rows:
+        if row["status"] == "ok":
+            kept[row["scene_class"]] = kept.get(row["scene_class"], 0) + 1
+            if kept[row["scene_class"]] <= keep:
+                continue
+        if row["created"] >= cutoff:
+            continue
+        removed.append(row["path"])
+        if not dry_run:
+            shutil.rmtree(row["path"], ignore_errors=True)
+            with db:
+                db.execute("DELETE FROM sessions WHERE id = ?", (row["id"],))
+    return removed
+
+def index_sessions(db, renders_dir="renders"):
+    """Record sessions with telemetry that aren't in the catalog yet; return how many."""
+    known = {row["path"] for row in db.execute("SELECT path FROM sessions")}
+    count = 0
+    for telemetry_file in sorted(Path(renders_dir).glob("session_*/telemetry.json")):
+        if session_key(telemetry_file.parent) not in known:
+            record_session(telemetry_file.parent, db)
+            count += 1
+    return count
+
+def main():
+    """Query or maintain the catalog from the command line."""
+    parser = argparse.ArgumentParser(description="Query the render session catalog.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    latest = commands.add_parser("latest", help="newest good session of a scene")
+    latest.add_argument("scene_class")
+    latest.add_argument("-q", "--quality")
+    latest.add_argument("--fps", type=int)
+    slower = commands.add_parser("slower", help="sessions slower than their scene's median render")
+    slower.add_argument("--scene")
+    slower.add_argument("--factor", type=float, default=1.2)
+    changed = commands.add_parser("changed", help="frames that differ between two sessions")
+    changed.add_argument("sessions", nargs="*", metavar="SESSION")
+    changed.add_argument("--scene", help="compare the two newest good sessions of this scene")
+    cleanup = commands.add_parser("prune", help="delete old sessions")
+    cleanup.add_argument("--keep", type=int, default=5, help="good sessions to keep per scene (default: 5)")
+    cleanup.add_argument("--days", type=float, default=14, help="never delete sessions newer than this")
+    cleanup.add_argument("--dry-run", action="store_true")
+    commands.add_parser("index", help="add existing sessions to the catalog")
+    args = parser.parse_args()
+
+    db = connect()
+
+    if args.command == "latest":
+        session = latest_session(db, args.scene_class, args.quality, args.fps)
+        if not session:
+            print(f"No good session of {args.scene_class}")
+            raise SystemExit(1)
+        print(session)
+
+    elif args.command == "slower":
+        rows = slower_sessions(db, args.scene, args.factor)
+        for row, baseline in rows:
+            print(f"{row['path']}: render {row['render_seconds']:.1f}s vs median {baseline:.1f}s "
+                  f"({row['scene_class']}, -q{row['quality']}, {row['fps']}fps, timing {row['timing'] or 'scene'})")
+        if not rows:
+            print("No sessions slower than their baseline")
+
+    elif args.command == "changed":
+        if args.scene:
+            rows = db.execute("SELECT path FROM sessions WHERE scene_class = ? AND status = 'ok' "
+                              "ORDER BY created DESC, id DESC LIMIT 2", (args.scene,)).fetchall()
+            sessions = [row["path"] for row in reversed(rows)]
+        else:
+            sessions = args.sessions
+        if len(sessions) != 2:
+            parser.error("changed needs two sessions, or --scene with two good sessions in the catalog")
+        try:
+            frames = changed_frames(db, *sessions)
+        except ValueError as error:
+            print(f"Error: {error}")
+            raise SystemExit(1)
+        print(f"{len(frames)} changed frame(s) from {sessions[0]} to {sessions[1]}")
+        for position, old, new in frames:
+            print(f"  {position + 1:>5}: {old or '-'} -> {new or '-'}")
+
+    elif args.command == "prune":
+        removed = prune(db, args.keep, args.days, args.dry_run)
+        verb = "Would remove" if args.dry_run else "Removed"
+        print(f"{verb} {len(removed)} session(s)")
+        for path in removed:
+            print(f"  {path}")
+
+    else:
+        print(f"Indexed {index_sessions(db)} session(s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Render matrices: many renders described in one JSON file.
+
+A matrix crosses scenes, datasets (see scene_datasets.py), qualities and
+frame rates:
+
+    {
+      "scenes": ["pairwise_comparison_animation.py:PairwiseComparisonSort"],
+      "datasets": {"default": null, "shelter": "datasets/shelter_tasks.json",
+                   "short": {"TASK_NAMES": ["Walk dogs", "Feed cats", "Clean kennels"]}},
+      "quality": ["l", "m", "h"],
+      "fps": [30],
+      "options": {"timing": "final"},
+      "retries": 2
+    }
+
+Datasets are a JSON file path, an inline object, or null for the scene's
+own inputs. "options" are passed to render_and_analyze.render_session
+(e.g. timing, config_file, contact_sheets, dedup).
+
+run_matrix() works through the jobs with a local queue. Each job renders
+in a fresh process. No more jobs run at once than there are cores, and
+their expected peak memory must fit in the memory available. The
+expectation comes from earlier sessions of the same scene and quality in
+the catalog (see render_catalog.py), falling back to DEFAULT_JOB_MEMORY_MB.
+Failed jobs are retried. Progress is saved to
+renders/matrix_<name>.state.json after every job, so running the same
+matrix again after a crash or an interrupted run skips finished jobs.
+Delete the state file to start over.
+"""
+
+import json
+import os
+import statistics
+import traceback
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import redirect_stdout
+from pathlib import Path
+
+MATRIX_OPTIONS = {"config_file", "in_process", "snapshots", "segments", "timing", "frame_format", "png_compression",
+                  "extract_jobs", "dedup", "dedup_threshold", "bundle", "contact_sheets"}
+# Peak memory of one render when the catalog has no earlier session to go by
+DEFAULT_JOB_MEMORY_MB = {"l": 800, "m": 1200, "h": 2000, "k": 4500}
+# Share of the available memory the queue plans to use
+MEMORY_HEADROOM = 0.8
+DEFAULT_RETRIES = 2
+
+def load_matrix(matrix_file):
+    """Read a matrix file and expand it into a list of job dicts."""
+    matrix = json.loads(Path(matrix_file).read_text())
+    unknown = set(matrix.get("options", {})) - MATRIX_OPTIONS
+    if unknown:
+        raise ValueError(f"unsupported options in {matrix_file}: {', '.join(sorted(unknown))}")
+
+    datasets = matrix.get("datasets") or {"default": None}
+    jobs = []
+    for spec in matrix["scenes"]:
+        scene_file, _, scene_class = spec.rpartition(":")
+        if not scene_file or not scene_class:
+            raise ValueError(f"scenes are given as FILE:CLASS, got '{spec}'")
+        for dataset_name, dataset in datasets.items():
+            if isinstance(dataset, dict):
+                dataset = json.dumps(dataset)
+            elif dataset:
+                dataset = str(Path(dataset).resolve())
+            for quality in matrix.get("quality", ["l"]):
+                quality = quality.removeprefix("-q")
+                for fps in matrix.get("fps", [1]):
+                    jobs.append({
+                        "id": f"{scene_class}|{dataset_name}|q{quality}|{fps}fps",
+                        "scene_file": scene_file,
+                        "scene_class": scene_class,
+                        "dataset": dataset,
+                        "quality": quality,
+                        "fps": fps,
+                        "options": matrix.get("options", {}),
+                    })
+    return jobs, matrix.get("retries", DEFAULT_RETRIES)
+
+def available_memory_mb():
+    """Memory the system can give new processes, or None if unknown."""
+    try:
+        for line in Path("/proc/meminfo").read_text().splitlines():
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (ValueError, OSError):
+        return None
+
+def job_memory_mb(scene_class, quality):
+    """Expected peak memory of a render: the median of earlier catalogued sessions."""
+    from render_catalog import connect
+
+    rows = connect().execute(
+        "SELECT telemetry FROM sessions WHERE scene_class = ? AND quality = ? AND status = 'ok' AND NOT cache_hit",
+        (scene_class, quality))
+    peaks = [json.loads(row["telemetry"]).get("peak_rss_mb") for row in rows]
+    peaks = [peak for peak in peaks if peak]
+    return statistics.median(peaks) if peaks else DEFAULT_JOB_MEMORY_MB.get(quality, DEFAULT_JOB_MEMORY_MB["h"])
+
+def run_job(job, log_file, use_cache=True):
+    """Render one matrix job in this (fresh) process; return the session path or None.
+
+    Output goes to log_file, so parallel jobs don't interleave on the terminal.
+    """
+    from render_and_analyze import render_session
+
+    with open(log_file, "a") as log, redirect_stdout(log):
+        try:
+            session = render_session(job["scene_file"], job["scene_class"], job["fps"], parallel=True,
+                                     quality=job["quality"], use_cache=use_cache, dataset=job["dataset"],
+                                     **job["options"])
+        except Exception:
+            traceback.print_exc(file=log)
+            return None
+    return str(session) if session else None
+
+def save_state(state_file, state):
+    """Write the matrix state atomically, so a crash never leaves it half-written."""
+    tmp = state_file.with_name(f"{state_file.name}.tmp{os.getpid()}")
+    tmp.write_text(json.dumps(state, indent=2))
+    os.replace(tmp, state_file)
+
+def run_matrix(matrix_file, max_workers=None, use_cache=True):
+    """Render every job of a matrix file, resuming an earlier run; return True if all succeeded."""
+    jobs, retries = load_matrix(matrix_file)
+    name = Path(matrix_file).stem
+    state_file = Path("renders") / f"matrix_{name}.state.json"
+    log_dir = Path("renders") / f"matrix_{name}_logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    state = json.loads(state_file.read_text()) if state_file.exists() else {}
+
+    finished = {job["id"] for job in jobs if state.get(job["id"], {}).get("status") == "done"
+                and Path(state[job["id"]]["session"]).exists()}
+    pending = deque(job for job in jobs if job["id"] not in finished)
+    if finished:
+        print(f"Resuming {name}: {len(finished)} of {len(jobs)} jobs already done")
+
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(pending) or 1))
+    memory = available_memory_mb()
+    budget = memory * MEMORY_HEADROOM if memory else None
+    estimates = {job["id"]: job_memory_mb(job["scene_class"], job["quality"]) for job in pending}
+    print(f"Rendering {len(pending)} jobs with up to {workers} workers"
+          + (f" within {budget:.0f} MB" if budget else ""))
+
+    attempts = {job["id"]: 0 for job in pending}
+    running = {}
+    done_count = len(finished)
+    # A fresh process per job: the dataset and timing are set through the environment
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        while pending or running:
+            while pending and len(running) < workers:
+                job = pending[0]
+                planned = sum(estimates[other["id"]] for other in running.values())
+                # Always let one job run, even if it alone exceeds the budget
+                if running and budget and planned + estimates[job["id"]] > budget:
+                    break
+                pending.popleft()
+                attempts[job["id"]] += 1
+                log_file = log_dir / f"{job['id'].replace('|', '_')}.log"
+                running[pool.submit(run_job, job, log_file, use_cache)] = job
+
+            completed, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in completed:
+                job = running.pop(future)
+                try:
+                    session = future.result()
+                except Exception as error:  # the worker process died
+                    session = None
+                    print(f"  {job['id']}: worker failed: {error}")
+
+                if session:
+                    done_count += 1
+                    state[job["id"]] = {"status": "done", "session": session, "attempts": attempts[job["id"]]}
+                    print(f"[{done_count}/{len(jobs)}] ✓ {job['id']}: {session}")
+                elif attempts[job["id"]] <= retries:
+                    pending.append(job)
+                    print(f"  ↻ {job['id']} failed, retrying ({attempts[job['id']]}/{retries + 1})")
+                else:
+                    state[job["id"]] = {"status": "failed", "attempts": attempts[job["id"]]}
+                    print(f"  ✗ {job['id']} failed {attempts[job['id']]} times "
+                          f"(log: {log_dir / (job['id'].replace('|', '_') + '.log')})")
+                save_state(state_file, state)
+
+    failed = [job["id"] for job in jobs if state.get(job["id"], {}).get("status") == "failed"]
+    print(f"\n{done_count} of {len(jobs)} jobs done" + (f", {len(failed)} failed" if failed else ""))
+    print(f"State: {state_file}")
+    return not failed and done_count == len(jobs)
@@ -0,0 +1,117 @@
+"""
+Sampling profiler for in-process scene renders.
+
+Samples the rendering thread's Python stack at a fixed interval and writes
+collapsed stacks (for flamegraph.pl or speedscope) plus a top-N table
+that separates time in scene methods from time in manim's text layout,
+Cairo rasterization, video writing and animation/scene logic.
+"""
+
+import sys
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+
+# Where time goes inside manim, matched against source paths from the leaf up
+CATEGORIES = [
+    ("text layout", ("manim/mobject/text/", "manim/mobject/svg/", "manimpango")),
+    # Only the camera and pycairo draw; manim/renderer/cairo_renderer.py is on every play() stack
+    ("cairo rasterization", ("manim/camera/", "/cairo/")),
+    ("ffmpeg/video writing", ("manim/scene/scene_file_writer.py", "/av/")),
+    ("animation/scene logic", ("manim/renderer/", "manim/animation/", "manim/scene/")),
+]
+
+class StackSampler:
+    """Sample the Python stack of the thread that created it."""
+
+    def __init__(self, scene_file, interval=0.005):
+        self.scene_file = str(Path(scene_file).resolve())
+        self.interval = interval
+        self.samples = Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(reversed(stack))] += 1
+
+    def label(self, code):
+        """Short name for a stack frame, e.g. pairwise_comparison_animation.py:create_task_card."""
+        return f"{Path(code.co_filename).name}:{code.co_name}"
+
+    def category(self, stack):
+        """Attribute a sample to a manim category, the scene itself, or other."""
+        for code in reversed(stack):
+            path = code.co_filename.replace("\\", "/")
+            for name, markers in CATEGORIES:
+                if any(marker in path for marker in markers):
+                    return name
+            # Reached the scene before any manim internals: e.g. building mobjects in construct()
+            if code.co_filename == self.scene_file:
+                return "scene code"
+        return "other"
+
+    def write_collapsed(self, path):
+        """Write stacks in the collapsed format used by flamegraph tools."""
+        with open(path, "w") as out:
+            for stack, count in self.samples.most_common():
+                out.write(";".join(self.label(code) for code in stack) + f" {count}\n")
+
+    def write_top(self, path, top=25):
+        """Write per-category, per-scene-method and per-function tables."""
+        total = sum(self.samples.values())
+        by_category = Counter()
+        by_method = defaultdict(Counter)
+        self_time = Counter()
+        inclusive = Counter()
+
+        for stack, count in self.samples.items():
+            category = self.category(stack)
+            by_category[category] += count
+            self_time[self.label(stack[-1])] += count
+            for label in {self.label(code) for code in stack}:
+                inclusive[label] += count
+            # Charge the sample to the innermost scene method on the stack
+            for code in reversed(stack):
+                if code.co_filename == self.scene_file:
+                    by_method[code.co_name][category] += count
+                    break
+
+        def percent(count):
+            return f"{100 * count / total:5.1f}%" if total else "  n/a"
+
+        lines = [f"{total} samples at {self.interval * 1000:.0f}ms intervals (~{total * self.interval:.1f}s)", ""]
+
+        lines.append("Time by category (innermost manim component on the stack):")
+        for category, count in by_category.most_common():
+            lines.append(f"  {percent(count)}  {category}")
+
+        lines += ["", "Scene methods (innermost scene frame), split by category:"]
+        methods = sorted(by_method.items(), key=lambda item: -sum(item[1].values()))
+        for method, categories in methods[:top]:
+            split = ", ".join(f"{name} {percent(count).strip()}" for name, count in categories.most_common())
+            lines.append(f"  {percent(sum(categories.values()))}  {method}  ({split})")
+
+        lines += ["", f"Top {top} functions by self time:"]
+        for label, count in self_time.most_common(top):
+            lines.append(f"  {percent(count)}  {label}")
+
+        lines += ["", f"Top {top} functions by inclusive time:"]
+        for label, count in inclusive.most_common(top):
+            lines.append(f"  {percent(count)}  {label}")
+
+        Path(path).write_text("\n".join(lines) + "\n")
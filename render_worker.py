@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Warm render worker for render_and_analyze.py.
+
+Keeps manim imported in a long-running process and serves render jobs over
+a Unix socket, so repeated renders skip interpreter startup, the manim
+import and Pango font setup. Each job re-imports the scene module, so
+edits are picked up without restarting the worker.
+
+Start it from the project root, then pass --worker to render_and_analyze.py:
+    poetry run python render_worker.py
+"""
+
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import traceback
+from contextlib import redirect_stdout
+from pathlib import Path
+
+SOCKET_PATH = Path("renders") / "render_worker.sock"
+
+def submit_job(job, socket_path=SOCKET_PATH):
+    """Send a render job to a running worker and return its reply.
+
+    Raises OSError when no worker is listening on socket_path.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_path))
+        client.sendall(json.dumps(job).encode() + b"\n")
+        with client.makefile("rb") as reply:
+            return json.loads(reply.readline())
+
+class RenderJobHandler(socketserver.StreamRequestHandler):
+    """Run one JSON-encoded render job per connection."""
+
+    def handle(self):
+        from render_and_analyze import render_session
+
+        output = io.StringIO()
+        try:
+            job = json.loads(self.rfile.readline())
+            print(f"Job: {job['scene_class']} from {job['scene_file']}")
+
+            # Jobs always render in this warm process, with manim already imported
+            job["in_process"] = True
+            with redirect_stdout(output):
+                session = render_session(**job)
+            reply = {"session": str(session.resolve()) if session else None, "log": output.getvalue()}
+        except Exception:
+            # Always answer, so the client reports the error instead of a closed connection
+            reply = {"session": None, "log": output.getvalue() + traceback.format_exc()}
+
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+        print(f"Done: {reply['session'] or 'failed'}")
+
+def warm_up():
+    """Import manim and lay out some text so fonts are loaded before the first job."""
+    from manim import Text
+
+    Text("warm up")
+
+def main():
+    """Serve render jobs until interrupted."""
+    socket_path = Path(sys.argv[1]) if len(sys.argv) > 1 else SOCKET_PATH
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # A socket file left behind by a crashed worker blocks bind()
+    if socket_path.exists():
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(str(socket_path))
+            print(f"Error: a worker is already listening on {socket_path}")
+            sys.exit(1)
+        except OSError:
+            socket_path.unlink()
+
+    print("Loading manim...")
+    warm_up()
+
+    # Jobs run one at a time: in-process renders share manim's global config
+    with socketserver.UnixStreamServer(str(socket_path), RenderJobHandler) as server:
+        print(f"Render worker listening on {socket_path} (pid {os.getpid()})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nStopping render worker")
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Input datasets for the sorting scenes.
+
+A dataset replaces a scene's input class attributes, e.g. TASK_NAMES and
+TASK_PRIORITIES of PairwiseComparisonSort or ARRAY of BinaryInsertionSort,
+without editing the scene file:
+
+    {"TASK_NAMES": ["Walk dogs", "Feed cats"], "TASK_PRIORITIES": {"Walk dogs": 7}}
+
+The dataset comes from the SFORA_DATASET environment variable, set by
+render_and_analyze.py --dataset or by a render matrix (see
+render_matrix.py). It holds either the path of a JSON file or the JSON
+itself, so it reaches manim subprocesses like the timing profile does.
+"""
+
+import json
+import os
+from pathlib import Path
+
+DATASET_ENV = "SFORA_DATASET"
+
+def load_dataset(dataset):
+    """The attribute overrides in dataset, a JSON file path or a JSON object string."""
+    text = dataset if dataset.lstrip().startswith("{") else Path(dataset).read_text()
+    overrides = json.loads(text)
+    if not isinstance(overrides, dict):
+        raise ValueError(f"A dataset must be a JSON object of class attributes, got {type(overrides).__name__}")
+    return overrides
+
+class DatasetMixin:
+    """Scene mixin that applies the dataset named by SFORA_DATASET.
+
+    Use as class MyScene(DatasetMixin, TimingProfileMixin, Scene). Only
+    attributes the scene class already defines can be replaced, so a typo
+    in a dataset fails the render instead of being ignored.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        dataset = os.environ.get(DATASET_ENV)
+        if not dataset:
+            return
+        for name, value in load_dataset(dataset).items():
+            if not hasattr(type(self), name):
+                raise ValueError(f"Dataset sets {name}, which {type(self).__name__} doesn't define")
+            setattr(self, name, value)
@@ -0,0 +1,84 @@
+"""
+Scene-graph growth monitor.
+
+Records the size of the scene graph after every play()/wait() and flags
+metrics that keep growing over the whole render. Mobjects that are never
+removed from the scene are rasterized on every later frame, so a leak
+shows up directly as slower long renders.
+"""
+
+import json
+import os
+import resource
+from pathlib import Path
+
+METRICS = ["mobjects", "submobjects", "points", "rss_mb"]
+
+def current_rss_mb():
+    """Resident set size of this process in MB."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, IndexError, ValueError):
+        # Peak rather than current RSS, but still shows growth
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+def scene_graph_stats(scene):
+    """Count top-level mobjects, all family members and bezier points on the scene."""
+    family = [mobject for top in scene.mobjects for mobject in top.get_family()]
+    return {
+        "mobjects": len(scene.mobjects),
+        "submobjects": len(family),
+        "points": sum(len(mobject.points) for mobject in family),
+        "rss_mb": current_rss_mb(),
+    }
+
+def scene_graph_recorder(records):
+    """Return an after_play hook that appends one stats record per animation to records."""
+    def record(scene, kind):
+        records.append({"index": scene.renderer.num_plays - 1, "kind": kind, **scene_graph_stats(scene)})
+    return record
+
+def find_unbounded_growth(records, metric, min_ratio=1.5):
+    """Decide whether a metric keeps growing through the render.
+
+    The run is split into quarters; growth is unbounded when every quarter
+    peaks higher than the one before and the last peak is at least
+    min_ratio times the first. Returns the animations that set a new high
+    in the second half of the run, or an empty list.
+    """
+    if len(records) < 8:
+        return []
+
+    values = [record[metric] for record in records]
+    size = len(values) // 4
+    peaks = [max(values[i * size:(i + 1) * size]) for i in range(3)] + [max(values[3 * size:])]
+    if not all(later > earlier for earlier, later in zip(peaks, peaks[1:])):
+        return []
+    if peaks[0] and peaks[-1] < peaks[0] * min_ratio:
+        return []
+
+    flagged = []
+    highest = max(values[:len(values) // 2])
+    for record in records[len(values) // 2:]:
+        if record[metric] > highest:
+            flagged.append({"index": record["index"], "kind": record["kind"], metric: record[metric],
+                            "increase": record[metric] - highest})
+            highest = record[metric]
+    return flagged
+
+def write_report(records, path):
+    """Save the per-animation records and growth flags; print a summary."""
+    flags = {metric: find_unbounded_growth(records, metric) for metric in METRICS}
+    Path(path).write_text(json.dumps({"records": records, "unbounded_growth": flags}, indent=2))
+
+    if not records:
+        return
+    first, last = records[0], records[-1]
+    print(f"Scene graph after {len(records)} animations: "
+          + ", ".join(f"{metric} {first[metric]} -> {last[metric]}" for metric in METRICS))
+    for metric, flagged in flags.items():
+        if flagged:
+            indices = ", ".join(str(entry["index"]) for entry in flagged[:10])
+            more = f" (+{len(flagged) - 10} more)" if len(flagged) > 10 else ""
+            print(f"  ⚠ {metric} grows without bound; new highs at animations {indices}{more}")
@@ -0,0 +1,193 @@
+"""
+In-process manim rendering.
+
+Imports scene modules directly and drives Scene.render() under a
+temporary config, so a render doesn't pay for Poetry resolution, a new
+interpreter and the manim import before the first frame is drawn.
+"""
+
+import argparse
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+# manim quality flag -> config.quality name
+QUALITY_NAMES = {"l": "low_quality", "m": "medium_quality", "h": "high_quality", "k": "fourk_quality"}
+
+# Modules imported by the last scene load, dropped before the next one
+_scene_modules = set()
+
+# Local modules kept across scene loads; their state only depends on their inputs
+SHARED_MODULES = {"text_cache"}
+
+def load_scene_class(scene_file, scene_class):
+    """Import scene_file fresh and return its scene_class.
+
+    Local modules the scene imported last time are dropped first, so edits
+    to the scene and its helpers are picked up in long-lived processes.
+    SHARED_MODULES stay loaded so their caches carry over between renders.
+    """
+    scene_file = Path(scene_file).resolve()
+    for name in _scene_modules:
+        sys.modules.pop(name, None)
+    _scene_modules.clear()
+
+    # Same as the manim CLI: the scene's directory is importable
+    if str(scene_file.parent) not in sys.path:
+        sys.path.insert(0, str(scene_file.parent))
+
+    before = set(sys.modules)
+    spec = importlib.util.spec_from_file_location(scene_file.stem, scene_file)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[scene_file.stem] = module
+    spec.loader.exec_module(module)
+
+    for name in set(sys.modules) - before | {scene_file.stem}:
+        if name in SHARED_MODULES:
+            continue
+        module_file = getattr(sys.modules[name], "__file__", None)
+        if module_file and Path(module_file).parent == scene_file.parent:
+            _scene_modules.add(name)
+
+    return getattr(module, scene_class)
+
+def hooked_scene_class(scene_class, after_play):
+    """Subclass scene_class so after_play(scene, kind) runs after every animation.
+
+    kind is "wait" for wait() calls and "play" otherwise. The subclass keeps
+    the original name so manim's output paths don't change.
+    """
+    from manim import Wait
+
+    def play(self, *args, **kwargs):
+        scene_class.play(self, *args, **kwargs)
+        is_wait = len(args) == 1 and isinstance(args[0], Wait)
+        after_play(self, "wait" if is_wait else "play")
+
+    return type(scene_class.__name__, (scene_class,), {"play": play})
+
+def render_scene(scene_file, scene_class, media_dir, fps=1, quality="l", config_file=None,
+                 overrides=None, after_play=None, null_renderer=False):
+    """Render scene_class from scene_file in this process.
+
+    scene_class is a class name, or an already-built Scene subclass.
+    Settings are applied in the same order as the manim CLI: config file
+    first, then quality and fps. With null_renderer, nothing is ever
+    rasterized. Returns the scene once rendered.
+    """
+    from manim import config, tempconfig
+
+    if isinstance(scene_class, type):
+        cls = scene_class
+    else:
+        cls = load_scene_class(scene_file, scene_class)
+    if after_play:
+        cls = hooked_scene_class(cls, after_play)
+    settings = {
+        # Names the media/videos/<scene file>/ directory, as on the manim command line
+        "input_file": str(scene_file),
+        "media_dir": str(media_dir),
+        "quality": QUALITY_NAMES[quality],
+        "frame_rate": fps,
+        "verbosity": "WARNING",
+        "progress_bar": "none",
+        **(overrides or {}),
+    }
+
+    with tempconfig({}):
+        if config_file:
+            config.digest_file(config_file)
+        for key, value in settings.items():
+            config[key] = value
+        scene = cls()
+        if null_renderer:
+            scene.renderer.update_frame = lambda *args, **kwargs: None
+        scene.render()
+
+    return scene
+
+def render_snapshots(scene_file, scene_class, frames_dir, media_dir, fps=1, quality="l", config_file=None,
+                     after_play=None):
+    """Save the end state of every play() and wait() as a PNG, without encoding video.
+
+    Animations run in manim's skip mode, so only the final frame of each
+    one is rasterized. Frames are named frame_<animation>_<kind>.png, where
+    <animation> is manim's 0-based animation number (as used by -n).
+    Returns the number of frames written.
+    """
+    frames_dir = Path(frames_dir)
+
+    def save_snapshot(scene, kind):
+        index = scene.renderer.num_plays - 1
+        scene.renderer.update_frame(scene)
+        scene.renderer.get_image().save(frames_dir / f"frame_{index:04d}_{kind}.png")
+        if after_play:
+            after_play(scene, kind)
+
+    # save_last_frame puts every animation in skip mode; nothing is written as video
+    overrides = {"write_to_movie": False, "save_last_frame": True}
+    scene = render_scene(scene_file, scene_class, media_dir, fps, quality, config_file,
+                         overrides=overrides, after_play=save_snapshot)
+    return scene.renderer.num_plays
+
+def scan_scene(scene_file, scene_class, media_dir, fps=1, quality="l", config_file=None):
+    """Run a scene without rasterizing anything and list its animations.
+
+    Returns one record per play()/wait() with manim's animation number,
+    the kind of call, its run time and the name of the section it is in.
+    """
+    records = []
+
+    def record(scene, kind):
+        sections = scene.renderer.file_writer.sections
+        records.append({"index": scene.renderer.num_plays - 1, "kind": kind, "run_time": scene.duration,
+                        "section": sections[-1].name if sections else None})
+
+    overrides = {"write_to_movie": False, "save_last_frame": True}
+    render_scene(scene_file, scene_class, media_dir, fps, quality, config_file,
+                 overrides=overrides, after_play=record, null_renderer=True)
+    return records
+
+def lint_scene(scene_file, scene_class, media_dir, fps=1, quality="l", config_file=None):
+    """Run a scene without rasterizing anything and lint the layout after every play().
+
+    Returns the issues found (see layout_linter.lint_state).
+    """
+    from layout_linter import layout_linter
+
+    issues = []
+    overrides = {"write_to_movie": False, "save_last_frame": True}
+    render_scene(scene_file, scene_class, media_dir, fps, quality, config_file,
+                 overrides=overrides, after_play=layout_linter(issues), null_renderer=True)
+    return issues
+
+def main():
+    """Scan or lint a scene from the command line and write the result as JSON.
+
+    Used by render_and_analyze.py when rendering through a poetry/manim
+    subprocess, where manim isn't importable in the calling interpreter.
+    """
+    parser = argparse.ArgumentParser(description="Inspect a manim scene without rendering it.")
+    parser.add_argument("command", choices=["scan", "lint"])
+    parser.add_argument("scene_file")
+    parser.add_argument("scene_class")
+    parser.add_argument("--output", required=True, help="JSON file to write")
+    parser.add_argument("--media-dir", default="media")
+    parser.add_argument("--fps", type=int, default=1)
+    parser.add_argument("--quality", choices=sorted(QUALITY_NAMES), default="l")
+    parser.add_argument("--config")
+    args = parser.parse_args()
+
+    if args.command == "lint":
+        from layout_linter import write_report
+
+        issues = lint_scene(args.scene_file, args.scene_class, args.media_dir, args.fps, args.quality, args.config)
+        write_report(issues, args.output)
+        return
+
+    records = scan_scene(args.scene_file, args.scene_class, args.media_dir, args.fps, args.quality, args.config)
+    Path(args.output).write_text(json.dumps(records, indent=2))
+
+if __name__ == "__main__":
+    main()
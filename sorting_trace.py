@@ -0,0 +1,125 @@
+"""
+Pure-Python pairwise sorting engine.
+
+Same binary insertion as SortingEngine in js/sorting-engine.js
+(continueSort/recordChoice): inclusive search bounds, mid = (low + high) // 2,
+"A" means the current item is more important and searches above mid, "B"
+searches below it, and "Equal" merges the item into the group at mid.
+
+The engine records what it does as a flat event trace, which the scenes
+replay instead of running their own binary search:
+
+    {"event": "start_insert", "item": 3, "low": 0, "high": 2}
+    {"event": "compare", "a": 3, "b": 1, "low": 0, "high": 2, "mid": 1}
+    {"event": "choose", "choice": "A"}
+    {"event": "place", "item": 3, "index": 1}
+
+Merges are recorded as a place event with "merged": True at the index of
+the group the item joined.
+"""
+
+CHOICES = ("A", "B", "Equal")
+
+class SortingEngine:
+    """Binary insertion sort driven by one pairwise choice at a time."""
+
+    def __init__(self, items):
+        items = list(items)
+        self.sorted_groups = []
+        self.unsorted = items[1:]
+        self.current = None
+        self.low = self.high = 0
+        self.done = False
+        self.trace = []
+
+        # Like the web app, the first item goes straight into the sorted list
+        if items:
+            self.trace.append({"event": "start_insert", "item": items[0], "low": 0, "high": -1})
+            self.trace.append({"event": "place", "item": items[0], "index": 0})
+            self.sorted_groups.append([items[0]])
+
+    def continue_sort(self):
+        """Advance until the next comparison is needed or the sort is done.
+
+        Returns {"done": True}, {"done": False, "needs_comparison": False}
+        after placing an item, or a dict with "comparison": (a, b).
+        """
+        if not self.unsorted and self.current is None:
+            self.done = True
+            return {"done": True}
+
+        if self.current is None:
+            self.current = self.unsorted.pop(0)
+            self.low, self.high = 0, len(self.sorted_groups) - 1
+            self.trace.append({"event": "start_insert", "item": self.current, "low": self.low, "high": self.high})
+
+        if self.low > self.high:
+            self.sorted_groups.insert(self.low, [self.current])
+            self.trace.append({"event": "place", "item": self.current, "index": self.low})
+            self.current = None
+            return {"done": False, "needs_comparison": False}
+
+        mid = (self.low + self.high) // 2
+        other = self.sorted_groups[mid][0]
+        self.trace.append({"event": "compare", "a": self.current, "b": other,
+                           "low": self.low, "high": self.high, "mid": mid})
+        return {"done": False, "needs_comparison": True, "comparison": (self.current, other)}
+
+    def record_choice(self, choice):
+        """Apply "A", "B" or "Equal" to the pending comparison and continue."""
+        if choice not in CHOICES:
+            raise ValueError(f"choice must be one of {', '.join(CHOICES)}, not {choice!r}")
+
+        mid = (self.low + self.high) // 2
+        self.trace.append({"event": "choose", "choice": choice})
+        if choice == "A":  # current item is more important
+            self.high = mid - 1
+        elif choice == "B":  # current item is less important
+            self.low = mid + 1
+        else:
+            self.sorted_groups[mid].append(self.current)
+            self.trace.append({"event": "place", "item": self.current, "index": mid, "merged": True})
+            self.current = None
+        return self.continue_sort()
+
+    def sorted_items(self):
+        """Items in sorted order, most important first."""
+        return [item for group in self.sorted_groups for item in group]
+
+def trace_sort(items, choose):
+    """Sort items, asking choose(a, b) for "A", "B" or "Equal"; return the event trace."""
+    engine = SortingEngine(items)
+    result = engine.continue_sort()
+    while not result["done"]:
+        if result["needs_comparison"]:
+            result = engine.record_choice(choose(*result["comparison"]))
+        else:
+            result = engine.continue_sort()
+    return engine.trace
+
+def priority_chooser(priorities, default=5):
+    """choose() for trace_sort that prefers the higher priority; ties go below."""
+    def choose(a, b):
+        return "A" if priorities.get(a, default) > priorities.get(b, default) else "B"
+    return choose
+
+def split_insertions(trace):
+    """Group a trace into one record per inserted item.
+
+    Each record has the "item", its "comparisons" (compare events with the
+    "choice" made) and the final "index" (plus "merged" when it joined a group).
+    """
+    insertions = []
+    for event in trace:
+        kind = event["event"]
+        if kind == "start_insert":
+            insertions.append({"item": event["item"], "comparisons": []})
+        elif kind == "compare":
+            insertions[-1]["comparisons"].append({key: value for key, value in event.items() if key != "event"})
+        elif kind == "choose":
+            insertions[-1]["comparisons"][-1]["choice"] = event["choice"]
+        elif kind == "place":
+            insertions[-1]["index"] = event["index"]
+            if event.get("merged"):
+                insertions[-1]["merged"] = True
+    return insertions
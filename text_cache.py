@@ -0,0 +1,46 @@
+"""
+Process-wide cache of laid-out Text mobjects.
+
+Pango layout and SVG parsing are among the most expensive steps of scene
+setup, and the scenes lay out the same strings over and over: task card
+lines, digit labels, "A"/"B" markers. Entries are keyed by everything that
+affects the layout (string, font size, color, scale and line wrapping) and
+callers always get a .copy(), so the cached original is never animated.
+"""
+
+from collections import OrderedDict
+
+from manim import DOWN, WHITE, Text, VGroup
+
+MAX_ENTRIES = 512
+
+_entries = OrderedDict()
+
+def _cached(key, build):
+    """Return a copy of the mobject stored under key, building it on a miss."""
+    mobject = _entries.get(key)
+    if mobject is None:
+        mobject = _entries[key] = build()
+        if len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+    else:
+        _entries.move_to_end(key)
+    return mobject.copy()
+
+def cached_text(text, font_size, color=WHITE, scale=1.0):
+    """Text(text, font_size=..., color=...).scale(scale), laid out once per process."""
+    key = ("text", text, font_size, str(color), scale)
+    return _cached(key, lambda: Text(text, font_size=font_size, color=color).scale(scale))
+
+def cached_lines(lines, font_size, color=WHITE, scale=1.0, buff=0.15):
+    """Lines of text stacked top to bottom, as used for wrapped card labels.
+
+    The line split is part of the key, so each wrapping rule gets its own
+    entry. A single line is returned as a plain Text.
+    """
+    if len(lines) == 1:
+        return cached_text(lines[0], font_size, color, scale)
+    key = ("lines", tuple(lines), font_size, str(color), scale, buff)
+    return _cached(key, lambda: VGroup(
+        *[cached_text(line, font_size, color, scale) for line in lines]
+    ).arrange(DOWN, buff=buff))
@@ -0,0 +1,162 @@
+"""
+Dry-run timeline estimates.
+
+Turns the animation list from a null-renderer scan (scene_runner.scan_scene)
+into a report: play()/wait() counts, timeline seconds per run_time constant
+of the scene class, the frame count at a given fps, and a wall-time estimate
+from the render throughput recorded in earlier sessions' telemetry.json.
+"""
+
+import ast
+import json
+import math
+import statistics
+from collections import defaultdict
+from pathlib import Path
+
+TIMING_WORDS = ("ANIMATION", "WAIT", "RUN_TIME")
+
+def class_attributes(scene_file, scene_class):
+    """Constant class attributes of scene_class, including inherited ones.
+
+    Read from the source so manim doesn't need to be importable. Base
+    classes are followed into the same file and into local modules it
+    imports them from; subclass values win.
+    """
+    modules = {}
+
+    def parse(path):
+        if path not in modules:
+            tree = ast.parse(path.read_text())
+            classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+            imported = {}
+            for node in tree.body:
+                if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                    local = path.parent / f"{node.module}.py"
+                    if local.exists():
+                        for alias in node.names:
+                            imported[alias.asname or alias.name] = (local, alias.name)
+                elif isinstance(node, ast.Import):
+                    for alias in node.names:
+                        local = path.parent / f"{alias.name}.py"
+                        if local.exists():
+                            imported[alias.asname or alias.name] = (local, None)
+            modules[path] = classes, imported
+        return modules[path]
+
+    def collect(path, name, seen):
+        if (path, name) in seen:
+            return {}
+        seen.add((path, name))
+        classes, imported = parse(path)
+        node = classes.get(name)
+        if node is None:
+            if name in imported and imported[name][1]:
+                return collect(*imported[name], seen)
+            return {}
+        attributes = {}
+        for base in node.bases:
+            if isinstance(base, ast.Name):
+                attributes.update(collect(path, base.id, seen))
+            elif (isinstance(base, ast.Attribute) and isinstance(base.value, ast.Name)
+                    and base.value.id in imported and imported[base.value.id][1] is None):
+                attributes.update(collect(imported[base.value.id][0], base.attr, seen))
+        for statement in node.body:
+            if (isinstance(statement, ast.Assign) and len(statement.targets) == 1
+                    and isinstance(statement.targets[0], ast.Name)
+                    and isinstance(statement.value, ast.Constant)):
+                attributes[statement.targets[0].id] = statement.value.value
+        return attributes
+
+    return collect(Path(scene_file).resolve(), scene_class, set())
+
+def timing_constants(scene_file, scene_class):
+    """Run-time constants of scene_class, e.g. {"FAST_ANIMATION": 0.3}.
+
+    These are the numeric class attributes named *ANIMATION*, *WAIT* or
+    *RUN_TIME* (see class_attributes).
+    """
+    return {name: value for name, value in class_attributes(scene_file, scene_class).items()
+            if any(word in name for word in TIMING_WORDS) and type(value) in (int, float)}
+
+def frames_for(run_time, fps):
+    """Frames manim writes for one animation of run_time seconds."""
+    return max(1, math.ceil(run_time * fps))
+
+def summarize_timeline(records, constants, fps):
+    """Group scanned animations by run_time and total them up.
+
+    Each bucket is labelled with the class constants whose value matches
+    its run_time, or with the raw value when none does.
+    """
+    buckets = defaultdict(lambda: {"calls": 0, "seconds": 0.0, "frames": 0, "kinds": set()})
+    for record in records:
+        bucket = buckets[round(record["run_time"], 6)]
+        bucket["calls"] += 1
+        bucket["seconds"] += record["run_time"]
+        bucket["frames"] += frames_for(record["run_time"], fps)
+        bucket["kinds"].add(record["kind"])
+
+    rows = []
+    for run_time, bucket in sorted(buckets.items(), key=lambda item: -item[1]["seconds"]):
+        names = [name for name, value in constants.items() if math.isclose(value, run_time)]
+        rows.append({
+            "run_time": run_time,
+            "label": "/".join(names) if names else f"run_time={run_time:g}s",
+            "kinds": sorted(bucket["kinds"]),
+            "calls": bucket["calls"],
+            "seconds": round(bucket["seconds"], 3),
+            "frames": bucket["frames"],
+        })
+
+    return {
+        "plays": sum(record["kind"] == "play" for record in records),
+        "waits": sum(record["kind"] == "wait" for record in records),
+        "duration": round(sum(record["run_time"] for record in records), 3),
+        "frames": sum(row["frames"] for row in rows),
+        "buckets": rows,
+    }
+
+def seconds_per_frame(scene_class, quality, sessions_dir="renders"):
+    """Median render seconds per frame from earlier full renders at this quality.
+
+    Sessions of the same scene class are preferred; other scenes are used
+    when there are none. Returns (seconds, sessions used, scope) or None.
+    """
+    same_scene, other_scenes = [], []
+    for telemetry_file in Path(sessions_dir).glob("session_*/telemetry.json"):
+        telemetry = json.loads(telemetry_file.read_text())
+        render_time = telemetry.get("phases", {}).get("render")
+        if (telemetry.get("status") != "ok" or telemetry.get("cache_hit") or telemetry.get("mode") == "snapshots"
+                or telemetry.get("quality") != quality or not render_time or not telemetry.get("frames")):
+            continue
+        # Deduplicated sessions keep fewer frames than were rendered
+        rate = render_time / telemetry.get("frames_extracted", telemetry["frames"])
+        (same_scene if telemetry.get("scene_class") == scene_class else other_scenes).append(rate)
+
+    if same_scene:
+        return statistics.median(same_scene), len(same_scene), scene_class
+    if other_scenes:
+        return statistics.median(other_scenes), len(other_scenes), "other scenes"
+    return None
+
+def format_seconds(seconds):
+    """1m 05s style duration."""
+    minutes, seconds = divmod(round(seconds), 60)
+    return f"{minutes}m {seconds:02d}s" if minutes else f"{seconds}s"
+
+def print_estimate(scene_class, summary, fps, quality, throughput):
+    """Print the timeline report and the wall-time estimate."""
+    print(f"\nEstimate for {scene_class} at {fps}fps (quality {quality}):")
+    print(f"  {summary['plays']} play() calls, {summary['waits']} wait() calls")
+    print(f"  {'run time':<36} {'calls':>6} {'timeline (s)':>13} {'frames':>8}")
+    for row in summary["buckets"]:
+        print(f"  {row['label']:<36} {row['calls']:>6} {row['seconds']:>13.1f} {row['frames']:>8}")
+    print(f"  Timeline {summary['duration']:.1f}s -> {summary['frames']} frames")
+
+    if throughput:
+        rate, count, scope = throughput
+        print(f"  Estimated render time: ~{format_seconds(summary['frames'] * rate)} "
+              f"({rate * 1000:.1f}ms/frame, median of {count} earlier session(s) of {scope})")
+    else:
+        print(f"  No earlier quality {quality} sessions with telemetry; render once to calibrate")
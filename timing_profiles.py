@@ -0,0 +1,103 @@
+"""
+Timing profiles for the sorting scenes.
+
+One scene class renders at different speeds instead of keeping a forked
+copy per speed:
+
+    final     the timings written in the scene
+    preview   quick review pass: short animations, waits capped at 0.3s
+    analysis  one frame per animation at the target fps and waits skipped,
+              plus one closing frame of the final state; for frame-by-frame
+              layout review, where waits only add encode time
+
+The profile comes from the SFORA_TIMING environment variable (set by
+render_and_analyze.py --timing or a [timing] profile = ... entry in its
+--config file), else from a [timing] section in ./manim.cfg, else from the
+scene class's TIMING_PROFILE.
+"""
+
+import configparser
+import os
+
+TIMING_ENV = "SFORA_TIMING"
+
+PROFILES = {
+    "final": {"constants": {}, "max_run_time": None},
+    "preview": {
+        "constants": {
+            "FAST_ANIMATION": 0.1,
+            "MEDIUM_ANIMATION": 0.1,
+            "SLOW_ANIMATION": 0.2,
+            "SHORT_WAIT": 0.2,
+            "MEDIUM_WAIT": 0.2,
+            "LONG_WAIT": 0.3,
+        },
+        "max_run_time": 0.3,
+    },
+    "analysis": {"constants": {}, "max_run_time": None},
+}
+
+# manim's run time when play() isn't given one
+DEFAULT_RUN_TIME = 1.0
+
+def config_timing(config_file):
+    """The [timing] profile named in a manim config file, or None."""
+    parser = configparser.ConfigParser()
+    parser.read(config_file)
+    return parser.get("timing", "profile", fallback=None)
+
+def selected_profile(default="final"):
+    """Name of the timing profile to render with."""
+    profile = os.environ.get(TIMING_ENV) or config_timing("manim.cfg") or default
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown timing profile '{profile}' (expected one of: {', '.join(PROFILES)})")
+    return profile
+
+class TimingProfileMixin:
+    """Scene mixin that applies the selected timing profile to play() and wait().
+
+    Use as class MyScene(TimingProfileMixin, Scene). The profile's constants
+    replace the class's FAST_ANIMATION etc.; run times passed directly to
+    play() and wait() are capped or replaced as the profile says.
+    """
+
+    TIMING_PROFILE = "final"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timing_profile = selected_profile(self.TIMING_PROFILE)
+        for name, value in PROFILES[self.timing_profile]["constants"].items():
+            setattr(self, name, value)
+
+    def play(self, *args, **kwargs):
+        from manim import Wait, config
+
+        is_wait = len(args) == 1 and isinstance(args[0], Wait)
+        if self.timing_profile == "analysis" and not is_wait:
+            # Shortest run time that still gets a frame at the target fps
+            kwargs["run_time"] = 1 / config.frame_rate
+        elif PROFILES[self.timing_profile]["max_run_time"] and not is_wait:
+            kwargs["run_time"] = min(kwargs.get("run_time", DEFAULT_RUN_TIME),
+                                     PROFILES[self.timing_profile]["max_run_time"])
+        super().play(*args, **kwargs)
+
+    def wait(self, duration=DEFAULT_RUN_TIME, *args, **kwargs):
+        if self.timing_profile == "analysis":
+            return
+        if PROFILES[self.timing_profile]["max_run_time"]:
+            duration = min(duration, PROFILES[self.timing_profile]["max_run_time"])
+        super().wait(duration, *args, **kwargs)
+
+    def tear_down(self):
+        # Each animation's one frame shows its start, so add one of the end state
+        if self.timing_profile == "analysis":
+            from manim import config
+            from manim.utils.exceptions import EndSceneEarlyException
+
+            # Renders that stop early (--segments, --section) have already
+            # passed their last animation; render() only catches this in construct()
+            try:
+                super().wait(1 / config.frame_rate)
+            except EndSceneEarlyException:
+                pass
+        super().tear_down()